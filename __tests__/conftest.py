@@ -0,0 +1,14 @@
+import pytest
+
+from app import helpers
+from app.fake_transact import FakeTransactServer
+
+
+@pytest.fixture
+def fake_transact(monkeypatch):
+    """Points `api_call` at a local fake Transact API for the test."""
+    with FakeTransactServer(invalid_routing=["011000015"]) as server:
+        monkeypatch.setattr(helpers, "TRANSACT_API_BASE_URL", server.url)
+        monkeypatch.setattr(helpers, "CLIENT_ID", "client")
+        monkeypatch.setattr(helpers, "DEVELOPER_API_KEY", "key")
+        yield server
@@ -0,0 +1,86 @@
+import threading
+from datetime import date
+
+from pydantic import ValidationError
+
+from app.batch import validate_many
+from app.cache import ValidationCache
+from app.helpers import credit_card_brand, get_session
+from app.models import AchAccount, CreditCard
+
+
+def test_validate_many_ach_accounts(fake_transact):
+    items = [
+        {"account": "123", "routing": "021000021"},
+        {"account": "123", "routing": "011000015"},
+        {"account": "12", "routing": "021000021"},
+    ] * 20
+    results = validate_many(AchAccount, items, max_workers=8)
+    assert len(results) == len(items)
+    for data, result in zip(items, results):
+        if data["routing"] == "011000015" or data["account"] == "12":
+            assert isinstance(result, ValidationError)
+        else:
+            assert result == AchAccount.construct(**data)
+
+
+def test_validate_many_shared_cache(fake_transact):
+    cache = ValidationCache(AchAccount, stripes=4)
+    items = [{"account": str(100 + i % 10), "routing": "021000021"} for i in range(200)]
+    results = validate_many(AchAccount, items, max_workers=16, cache=cache)
+    assert [r.account for r in results] == [d["account"] for d in items]
+    info = cache.info()
+    assert info.hits + info.misses == 200
+    assert info.currsize == 10
+    assert fake_transact.requests == info.misses
+
+
+def test_concurrent_misses_validate_once(fake_transact):
+    fake_transact.latency = 0.05
+    cache = ValidationCache(AchAccount)
+    items = [{"account": "123", "routing": "021000021"}] * 32
+    results = validate_many(AchAccount, items, max_workers=16, cache=cache)
+    assert all(r == AchAccount.construct(**items[0]) for r in results)
+    assert (cache.info().hits, cache.info().misses) == (31, 1)
+    assert fake_transact.requests == 1
+
+
+def test_stress_shared_cache_and_brand():
+    cache = ValidationCache(CreditCard, maxsize=64, stripes=8)
+    numbers = ["4242424242424242", "5555555555554444", "378282246310005"]
+    errors = []
+
+    def work(worker: int) -> None:
+        for i in range(300):
+            number = numbers[(worker + i) % len(numbers)]
+            cc = cache.validate(
+                {
+                    "name": "Test",
+                    "number": number,
+                    "month": str(1 + i % 12),
+                    "year": str(date.today().year),
+                    "cvv": "123",
+                }
+            )
+            if cc.number != number or cc.brand != credit_card_brand(number):
+                errors.append((worker, i))
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    info = cache.info()
+    assert info.hits + info.misses == 8 * 300
+    assert info.currsize <= 64
+
+
+def test_sessions_are_per_thread():
+    sessions = []
+    t = threading.Thread(target=lambda: sessions.append(get_session()))
+    t.start()
+    t.join()
+    assert get_session() is get_session()
+    assert sessions[0] is not get_session()
@@ -0,0 +1,104 @@
+from datetime import date
+
+import pytest
+
+from app import bin_table
+from app.bin_table import BinInfo, BinTable, CardType, build_bin_table
+from app.models import CreditCard
+
+CSV = """bin_start,bin_end,issuer,country,card_type
+424242,,Stripe Test Bank,US,credit
+40000566,40000566,Debit Union,GB,debit
+555555,555599,Mastercard Bank,us,prepaid
+"""
+
+
+@pytest.fixture
+def table(tmp_path):
+    csv_path = tmp_path / "bins.csv"
+    csv_path.write_text(CSV)
+    out_path = tmp_path / "bins.bin"
+    assert build_bin_table(str(csv_path), str(out_path)) == 3
+    t = BinTable(str(out_path))
+    yield t
+    t.close()
+
+
+def test_lookup_six_digit_bin(table):
+    info = table.lookup("4242424242424242")
+    assert info == BinInfo("Stripe Test Bank", "US", CardType.CREDIT)
+
+
+def test_lookup_eight_digit_bin(table):
+    assert table.lookup("4000056655665556").issuer == "Debit Union"
+    assert table.lookup("4000056755665556") is None
+
+
+def test_lookup_range(table):
+    for number in ("5555555555554444", "5555990000000000"):
+        info = table.lookup(number)
+        assert info == BinInfo("Mastercard Bank", "US", CardType.PREPAID)
+    assert table.lookup("5556000000000000") is None
+
+
+def test_lookup_invalid_input(table):
+    assert table.lookup("4242") is None
+    assert table.lookup("4242abcd42424242") is None
+    assert table.lookup("1000000000000000") is None
+
+
+def test_lookup_many(table):
+    infos = table.lookup_many(["4242424242424242", "6011111111111117"])
+    assert [i and i.issuer for i in infos] == ["Stripe Test Bank", None]
+    assert len(table) == 3
+
+
+def test_build_rejects_overlaps(tmp_path):
+    csv_path = tmp_path / "bins.csv"
+    csv_path.write_text(CSV + "42424242,,Overlap Bank,US,credit\n")
+    with pytest.raises(ValueError):
+        build_bin_table(str(csv_path), str(tmp_path / "bins.bin"))
+
+
+def test_long_issuer_names_are_cut_on_a_character(tmp_path):
+    csv_path = tmp_path / "bins.csv"
+    csv_path.write_text(
+        "bin_start,bin_end,issuer,country,card_type\n"
+        f"424242,,{'é' * 200},FR,credit\n",
+        encoding="utf-8",
+    )
+    out_path = str(tmp_path / "bins.bin")
+    build_bin_table(str(csv_path), out_path)
+    t = BinTable(out_path)
+    assert t.lookup("4242424242424242").issuer == "é" * 127
+    t.close()
+
+
+def test_build_rejects_too_many_issuers(tmp_path, monkeypatch):
+    monkeypatch.setattr(bin_table, "MAX_ISSUERS", 2)
+    csv_path = tmp_path / "bins.csv"
+    csv_path.write_text(CSV)
+    with pytest.raises(ValueError, match="issuers"):
+        build_bin_table(str(csv_path), str(tmp_path / "bins.bin"))
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / "bins.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        BinTable(str(path))
+
+
+def test_credit_card_bin_info(table, monkeypatch):
+    cc = CreditCard(
+        name="Test",
+        number="4242424242424242",
+        month="01",
+        year=str(date.today().year),
+        cvv="123",
+    )
+    monkeypatch.setattr(bin_table, "_table", None)
+    monkeypatch.setattr(bin_table, "BIN_TABLE_PATH", None)
+    assert cc.bin_info is None
+    monkeypatch.setattr(bin_table, "BIN_TABLE_PATH", table.path)
+    assert cc.bin_info.country == "US"
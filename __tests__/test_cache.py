@@ -0,0 +1,116 @@
+from datetime import date
+
+import pytest
+from pydantic import BaseModel, ValidationError, validator
+
+from app.cache import ValidationCache, input_key
+from app.models import Accreditation, CreditCard
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def credit_card_input(**overrides):
+    data = {
+        "name": "Test",
+        "number": "4242424242424242",
+        "month": "01",
+        "year": str(date.today().year),
+        "cvv": "123",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_cache_hit():
+    cache = ValidationCache(CreditCard)
+    first = cache.validate(credit_card_input())
+    second = cache.validate(credit_card_input())
+    assert first == second
+    assert first is not second
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    assert info.hit_rate == 0.5
+
+
+def test_cache_errors():
+    cache = ValidationCache(CreditCard)
+    for _ in range(2):
+        with pytest.raises(ValidationError) as e:
+            cache.validate(credit_card_input(cvv="12"))
+        assert e.value.errors()[0]["loc"] == ("cvv",)
+    assert cache.info().hits == 1
+
+
+def test_cache_key_ignores_order():
+    assert input_key({"a": 1, "b": 2}) == input_key({"b": 2, "a": 1})
+    assert input_key({"a": 1}) != input_key({"a": "1"})
+
+
+def test_cache_key_does_not_contain_input():
+    key = input_key(credit_card_input())
+    assert b"4242424242424242" not in key
+
+
+def test_cache_ttl():
+    timer = FakeTimer()
+    cache = ValidationCache(Accreditation, ttl=10, timer=timer)
+    cache.validate({"net_worth": 1})
+    timer.now = 9
+    cache.validate({"net_worth": 1})
+    timer.now = 10
+    cache.validate({"net_worth": 1})
+    assert (cache.info().hits, cache.info().misses) == (1, 2)
+
+
+def test_cache_maxsize():
+    cache = ValidationCache(Accreditation, maxsize=2)
+    cache.validate({"net_worth": 1})
+    cache.validate({"net_worth": 2})
+    cache.validate({"net_worth": 1})
+    cache.validate({"net_worth": 3})
+    assert cache.info().currsize == 2
+    cache.validate({"net_worth": 1})
+    cache.validate({"net_worth": 2})
+    assert (cache.info().hits, cache.info().misses) == (2, 4)
+
+
+def test_cache_bypassed_for_unhashable_input():
+    cache = ValidationCache(Accreditation)
+    cache.validate({"net_worth": date.today().year, "extra": date.today()})
+    assert cache.info().currsize == 0
+
+
+def test_unexpected_error_is_not_cached():
+    calls = []
+
+    class Flaky(BaseModel):
+        x: int
+
+        @validator("x")
+        def fail_once(cls, x: int) -> int:
+            calls.append(x)
+            if len(calls) == 1:
+                raise RuntimeError("transient")
+            return x
+
+    cache = ValidationCache(Flaky)
+    with pytest.raises(RuntimeError):
+        cache.validate({"x": 1})
+    assert cache.validate({"x": 1}).x == 1
+    assert cache.info().currsize == 1
+
+
+def test_stripes_share_maxsize():
+    cache = ValidationCache(Accreditation, maxsize=10, stripes=4)
+    for i in range(100):
+        cache.validate({"annual_income": i})
+    assert cache.info().currsize <= 10
+    for stripes in (0, 11):
+        with pytest.raises(ValueError):
+            ValidationCache(Accreditation, maxsize=10, stripes=stripes)
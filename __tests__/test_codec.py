@@ -0,0 +1,86 @@
+import json
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from app import codec
+from app.models import Accreditation, AchAccount, CreditCard
+
+
+def make_credit_card() -> CreditCard:
+    return CreditCard(
+        name="Test",
+        number="4242424242424242",
+        month="01",
+        year=str(date.today().year),
+        cvv="123",
+    )
+
+
+def test_dumps_matches_pydantic():
+    cc = make_credit_card()
+    assert json.loads(codec.dumps(cc)) == json.loads(cc.json())
+
+    a = Accreditation(annual_income=199_999.99, net_worth=1_000_000)
+    assert json.loads(codec.dumps(a)) == json.loads(a.json())
+
+
+def test_dumps_large_int():
+    a = Accreditation(annual_income=10**20, net_worth=1)
+    assert json.loads(codec.dumps(a)) == json.loads(a.json())
+
+
+def test_loads_round_trip():
+    cc = make_credit_card()
+    assert codec.loads(CreditCard, codec.dumps(cc)) == cc
+    assert codec.loads(CreditCard, codec.dumps(cc).encode()) == cc
+
+
+def test_loads_invalid_input():
+    with pytest.raises(ValidationError):
+        codec.loads(Accreditation, '{"annual_income": -1}')
+
+
+def test_dumps_masked_credit_card():
+    data = json.loads(codec.dumps(make_credit_card(), masked=True))
+    assert data["number"] == "************4242"
+    assert data["cvv"] == "***"
+    assert data["name"] == "Test"
+
+
+def test_dumps_masked_ach_account():
+    ach = AchAccount.construct(account="123456789", routing="021000021")
+    data = json.loads(codec.dumps(ach, masked=True))
+    assert data["account"] == "*****6789"
+    assert data["routing"] == "021000021"
+
+
+def test_mask_short_value():
+    assert codec.mask("123") == "***"
+    assert codec.mask("1234") == "****"
+    assert codec.mask("12345") == "*2345"
+    assert codec.mask("123", 0) == "***"
+
+
+def test_dumps_masked_short_account():
+    ach = AchAccount.construct(account="1234", routing="021000021")
+    assert "1234" not in codec.dumps(ach, masked=True)
+
+
+def test_parse_json_many_array():
+    models = codec.parse_json_many(
+        Accreditation,
+        '[{"annual_income": 1}, {"net_worth": 2}]',
+    )
+    assert [m.annual_income for m in models] == [1, 0]
+    assert [m.net_worth for m in models] == [0, 2]
+
+
+def test_parse_json_many_ndjson():
+    models = codec.parse_json_many(
+        Accreditation,
+        b'{"annual_income": 1}\n\n{"net_worth": 2}\n',
+    )
+    assert [m.annual_income for m in models] == [1, 0]
+    assert [m.net_worth for m in models] == [0, 2]
@@ -0,0 +1,170 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from app import columnar
+from app import scheduler as scheduler_module
+from app.models import Accreditation, AchAccount, CreditCard
+from app.rules import Rule
+from app.scheduler import Priority, Scheduler, set_scheduler
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+YEAR = date.today().year
+# Arabic-Indic digits, which `int()` accepts but Arrow's casts don't.
+ARABIC_INDIC = str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩")
+
+CREDIT_CARDS = [
+    ("Test", "4242424242424242", "01", str(YEAR), "123"),
+    ("Test", "378282246310005", "12", str(YEAR + 10), "000"),
+    ("Test", "5555555555554444", "1", str(YEAR + 1), "999"),
+    ("Test", "6011111111111117", "06", str(YEAR), "123"),
+    ("Test", "3056930009020004", "01", str(YEAR), "123"),
+    ("T", "4242424242424242", "01", str(YEAR), "123"),
+    ("T2", "4242424242424242", "01", str(YEAR), "123"),
+    ("Test", "424242424242424", "01", str(YEAR), "123"),
+    ("Test", "38520000023237", "01", str(YEAR), "123"),
+    ("Test", "4242424242424242", "00", str(YEAR), "123"),
+    ("Test", "4242424242424242", "13", str(YEAR), "123"),
+    ("Test", "4242424242424242", "01", str(YEAR - 1), "123"),
+    ("Test", "4242424242424242", "01", str(YEAR + 11), "123"),
+    ("Test", "4242424242424242", "01", "20xx", "123"),
+    ("Test", "4242424242424242", "01", str(YEAR), "12"),
+    ("Test", "4242424242424242", "01", str(YEAR), "1234"),
+    ("Test", "4242424242424242", "99999999999999999999", str(YEAR), "123"),
+    ("Test", "4242424242424242", "٣", str(YEAR + 1).translate(ARABIC_INDIC), "123"),
+    ("Test", "4242424242424242", "١٣", str(YEAR), "123"),
+    ("Test", None, "01", str(YEAR), "123"),
+]
+FIELDS = ("name", "number", "month", "year", "cvv")
+
+
+def model_valid(model, data) -> bool:
+    try:
+        model(**{k: v for k, v in data.items() if v is not None})
+        return True
+    except ValidationError:
+        return False
+
+
+def to_batch(rows, fields):
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(c, pa.string()) for c in columns], names=list(fields)
+    )
+
+
+def test_credit_cards_match_model():
+    result = columnar.validate_credit_cards(to_batch(CREDIT_CARDS, FIELDS))
+    valid = result.column("valid").to_pylist()
+    for row, ok in zip(CREDIT_CARDS, valid):
+        assert ok == model_valid(CreditCard, dict(zip(FIELDS, row))), row
+
+    brands = result.column("brand").to_pylist()
+    assert brands[:5] == ["VI", "AM", "MC", "DI", None]
+
+
+def test_credit_card_field_masks():
+    result = columnar.validate_credit_cards(to_batch(CREDIT_CARDS, FIELDS))
+    assert result.column("name_valid").to_pylist()[5:7] == [False, False]
+    assert result.column("month_valid").to_pylist()[9:11] == [False, False]
+    assert result.column("cvv_valid").to_pylist()[14:16] == [False, False]
+    assert result.column("number_valid").to_pylist()[-1] is False
+
+
+def test_accreditations_match_model():
+    incomes = [0, 1_000_000, 200_000, 199_999.99, 999_999_999, -1, None, -0.5]
+    worths = [0, 0, 1_000_000, 1_000_000, 999_999_999, 0, 1_000_000, 0]
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array(incomes, pa.float64()), pa.array(worths, pa.int64())],
+        names=["annual_income", "net_worth"],
+    )
+    result = columnar.validate_accreditations(batch)
+    for i, (income, worth) in enumerate(zip(incomes, worths)):
+        data = {"annual_income": income, "net_worth": worth}
+        assert result.column("valid")[i].as_py() == model_valid(Accreditation, data)
+        if income is None or income >= 0:
+            a = Accreditation(**{k: v for k, v in data.items() if v is not None})
+            assert result.column("spend_capacity")[i].as_py() == a.spend_capacity
+            assert result.column("accredited")[i].as_py() == a.accredited
+
+
+def test_accreditations_bad_amounts_invalidate_their_rows():
+    incomes = ["abc", "1e20", " 250000 ", "nan", "-5", "1.5e6", "", None, "-0.5"]
+    incomes += ["50000.5", "1_000", "١٠٠٠", "Infinity"]
+    worths = [1e20, 2_000_000, 2_000_000, 0, 0, 1_000_000, 0, 1e20, 0]
+    worths += [1_000_000, 1_000_000, 1_000_000, 1_000_000]
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array(incomes, pa.string()), pa.array(worths, pa.float64())],
+        names=["annual_income", "net_worth"],
+    )
+    result = columnar.validate_accreditations(batch)
+    for i, (income, worth) in enumerate(zip(incomes, worths)):
+        data = {"annual_income": income, "net_worth": worth}
+        valid = model_valid(Accreditation, data)
+        assert result.column("valid")[i].as_py() == valid, data
+        if valid:
+            a = Accreditation(**{k: v for k, v in data.items() if v is not None})
+            assert result.column("spend_capacity")[i].as_py() == a.spend_capacity
+            assert result.column("accredited")[i].as_py() == a.accredited
+        else:
+            assert result.column("spend_capacity")[i].as_py() is None
+            assert result.column("accredited")[i].as_py() is None
+    assert result.column("annual_income_valid").to_pylist()[:2] == [False, True]
+
+
+def test_ach_accounts_verify_distinct_routing_numbers(fake_transact):
+    rows = [
+        ("123", "021000021"),
+        ("123", "011000015"),
+        ("12", "021000021"),
+        ("123456789", "0210000210"),
+    ] * 50
+    result = columnar.validate_ach_accounts(to_batch(rows, ("account", "routing")))
+    assert fake_transact.requests == 2
+    for (account, routing), ok in zip(rows, result.column("valid").to_pylist()):
+        data = {"account": account, "routing": routing}
+        assert ok == model_valid(AchAccount, data), data
+
+
+def test_ach_accounts_verify_in_bulk_lane(fake_transact, monkeypatch):
+    s = Scheduler(rate=1000)
+    monkeypatch.setattr(scheduler_module, "_scheduler", None)
+    set_scheduler(s)
+    rows = [("123", "021000021"), ("123", "011000015")]
+    columnar.validate_ach_accounts(to_batch(rows, ("account", "routing")))
+    stats = s.stats()
+    assert stats[Priority.BULK].admitted == 2
+    assert stats[Priority.INTERACTIVE].admitted == 0
+
+
+def test_validate_parquet(tmp_path):
+    source, dest = tmp_path / "in.parquet", tmp_path / "out.parquet"
+    table = pa.Table.from_batches([to_batch(CREDIT_CARDS, FIELDS)])
+    pq.write_table(table, source, row_group_size=5)
+
+    rows = columnar.validate_parquet(
+        str(source), str(dest), columnar.validate_credit_cards, batch_size=4
+    )
+    assert rows == len(CREDIT_CARDS)
+    out = pq.read_table(dest)
+    assert out.column_names[:5] == list(FIELDS)
+    assert out.column("valid").to_pylist()[:3] == [True, True, True]
+
+
+def test_rule_mask_checksum():
+    mask = columnar.rule_mask(
+        pa.array(["021000021", "021000022", None, "abc"]),
+        Rule("Bad.", checksum="aba"),
+    )
+    assert mask.to_pylist() == [True, False, False, False]
+
+
+def test_rule_mask_digits_match_model():
+    column = pa.array(["123", "¹²³", "12a"])
+    rule = Rule("Bad.", digits=True)
+    assert columnar.rule_mask(column, rule).to_pylist() == [True, True, False]
+    ranged = Rule("Bad.", min_value=1, max_value=999)
+    assert columnar.rule_mask(column, ranged).to_pylist() == [True, False, False]
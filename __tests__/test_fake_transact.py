@@ -0,0 +1,38 @@
+import pytest
+from pydantic import ValidationError
+
+from app.fake_transact import FakeTransactServer
+from app.helpers import api_call, validate_aba_routing_number
+from app.models import AchAccount
+
+
+def test_valid_routing_number(fake_transact):
+    r = validate_aba_routing_number("021000021")
+    assert r["statusCode"] == "101"
+    ach = AchAccount(account="123", routing="021000021")
+    assert ach.routing == "021000021"
+
+
+def test_invalid_routing_number(fake_transact):
+    assert validate_aba_routing_number("011000015")["statusCode"] == "215"
+    with pytest.raises(ValidationError):
+        AchAccount(account="123", routing="011000015")
+    with pytest.raises(ValidationError):
+        AchAccount(account="123", routing="123456789")
+
+
+def test_connection_reuse(fake_transact):
+    for _ in range(5):
+        validate_aba_routing_number("021000021")
+    assert fake_transact.requests == 5
+    assert fake_transact.connections == 1
+
+
+def test_error_rate(monkeypatch):
+    with FakeTransactServer(error_rate=1.0) as server:
+        monkeypatch.setattr("app.helpers.TRANSACT_API_BASE_URL", server.url)
+        assert api_call("POST", "validateABARoutingnumber")["statusCode"] == "1400"
+
+
+def test_unknown_endpoint(fake_transact):
+    assert api_call("POST", "createParty")["statusCode"] == "404"
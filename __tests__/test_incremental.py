@@ -0,0 +1,85 @@
+from datetime import date
+
+import pytest
+
+from app.incremental import FieldResult, FormValidator
+from app.models import AchAccount, CreditCard
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_single_field():
+    form = FormValidator(CreditCard)
+    results = form.update(cvv="12")
+    assert results == {"cvv": FieldResult("12", "Must be a 3 digit number.")}
+    assert form.update(cvv="123")["cvv"].valid
+
+
+def test_unknown_field():
+    with pytest.raises(KeyError):
+        FormValidator(CreditCard).update(pin="1234")
+
+
+def test_only_changed_fields_are_revalidated(fake_transact):
+    form = FormValidator(AchAccount, stable_after=0)
+    form.update(account="123", routing="021000021")
+    form.update(account="1234", routing="021000021")
+    form.update(account="12", routing="021000021")
+    assert fake_transact.requests == 1
+    assert form.results["account"].error == "Must be between 3 and 17 digits."
+    assert form.results["routing"].valid
+
+
+def test_build_credit_card():
+    form = FormValidator(CreditCard)
+    form.update(name="Test", number="4242424242424242", month="01")
+    assert form.build() is None
+    form.update(year=str(date.today().year), cvv="123")
+    cc = form.build()
+    assert cc.number == "4242424242424242"
+    form.update(cvv="1")
+    assert form.build() is None
+
+
+def test_routing_number_is_deferred_until_stable(fake_transact):
+    timer = FakeTimer()
+    form = FormValidator(AchAccount, stable_after=0.5, timer=timer)
+    for i in range(1, 10):
+        timer.now += 0.1
+        result = form.update(account="123", routing="021000021"[:i])["routing"]
+        if i < 9:
+            assert result.error == "Accepted routing numbers must be exactly 9 digits."
+    assert result.pending
+    assert fake_transact.requests == 0
+
+    timer.now += 0.4
+    assert form.poll()["routing"].pending
+    timer.now += 0.1
+    assert form.poll()["routing"] == FieldResult("021000021")
+    assert fake_transact.requests == 1
+
+    # Going back to a number already checked reuses its result.
+    form.update(routing="02100002")
+    form.update(routing="021000021")
+    assert form.results["routing"].valid
+    assert fake_transact.requests == 1
+    assert form.build() == AchAccount.construct(account="123", routing="021000021")
+
+
+def test_flush_invalid_routing_number(fake_transact):
+    form = FormValidator(AchAccount, timer=FakeTimer())
+    assert form.update(routing="011000015")["routing"].pending
+    assert form.flush()["routing"].error == "Invalid routing number"
+    assert fake_transact.requests == 1
+
+
+def test_non_string_deferred_field(fake_transact):
+    form = FormValidator(AchAccount)
+    assert form.update(routing=None)["routing"].error
+    assert fake_transact.requests == 0
@@ -0,0 +1,80 @@
+import pytest
+
+from app.models import ACH_ACCOUNT_RULES, CREDIT_CARD_FIELD_RULES
+from app.rules import Rule, aba_checksum, compile_rule, compile_schema, luhn_checksum
+
+
+def test_luhn_checksum():
+    assert luhn_checksum("4242424242424242")
+    assert luhn_checksum("378282246310005")
+    assert not luhn_checksum("4242424242424241")
+
+
+def test_aba_checksum():
+    assert aba_checksum("021000021")
+    assert aba_checksum("011401533")
+    assert not aba_checksum("021000022")
+    assert not aba_checksum("02100002")
+
+
+def test_compile_rule_is_cached():
+    rule = Rule("Must be 3 digits.", digits=True, min_length=3, max_length=3)
+    assert compile_rule(rule) is compile_rule(rule._replace())
+
+
+def test_compile_rule_digits_and_length():
+    check = compile_rule(Rule("Bad.", digits=True, min_length=2, max_length=4))
+    assert check("12") == "12"
+    assert check("1234") == "1234"
+    for value in ("1", "12345", "1a", ""):
+        with pytest.raises(ValueError, match="Bad."):
+            check(value)
+
+
+def test_compile_rule_digits_match_isdigit():
+    # Same as the original `cvv.isdigit()` check; ranges and checksums, which
+    # convert with `int()`, need decimal digits.
+    assert compile_rule(Rule("Bad.", digits=True))("¹²³") == "¹²³"
+    with pytest.raises(ValueError):
+        compile_rule(Rule("Bad.", min_value=1, max_value=12))("¹")
+
+
+def test_compile_rule_value_range_implies_digits():
+    check = compile_rule(Rule("Bad.", min_value=1, max_value=12))
+    assert check("01") == "01"
+    assert check("12") == "12"
+    for value in ("0", "13", "-1", "a"):
+        with pytest.raises(ValueError):
+            check(value)
+
+
+def test_compile_rule_pattern_and_checksum():
+    check = compile_rule(Rule("Bad.", pattern=r"4\d{15}", checksum="luhn"))
+    assert check("4242424242424242")
+    with pytest.raises(ValueError):
+        check("5555555555554444")
+    with pytest.raises(ValueError):
+        check("4242424242424241")
+
+
+def test_compile_rule_unknown_checksum():
+    with pytest.raises(ValueError):
+        compile_rule(Rule("Bad.", checksum="crc32"))
+
+
+def test_compile_schema_credit_card():
+    check = compile_schema(CREDIT_CARD_FIELD_RULES)
+    assert check({"month": "01", "cvv": "123"}) == {}
+    assert check({"month": "13", "cvv": 123}) == {
+        "month": "Must be between 1 and 12.",
+        "cvv": "str type expected",
+    }
+
+
+def test_compile_schema_ach_account():
+    check = compile_schema(ACH_ACCOUNT_RULES)
+    assert check({"account": "123", "routing": "021000021"}) == {}
+    assert check({"account": "12"}) == {
+        "account": "Must be between 3 and 17 digits.",
+        "routing": "field required",
+    }
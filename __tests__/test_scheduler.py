@@ -0,0 +1,172 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from app import scheduler as scheduler_module
+from app.batch import validate_many
+from app.helpers import validate_aba_routing_number
+from app.models import AchAccount
+from app.scheduler import (
+    DeadlineExceeded,
+    Priority,
+    QueueFull,
+    Scheduler,
+    SharedTokenBucket,
+    TokenBucket,
+    current_priority,
+    priority,
+    set_scheduler,
+)
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, burst=2, now=0)
+    assert bucket.take(0) == 0
+    assert bucket.take(0) == 0
+    assert bucket.take(0) == pytest.approx(0.1)
+    assert bucket.take(0.05) == pytest.approx(0.05)
+    assert bucket.take(0.1) == 0
+
+
+def test_shared_token_bucket(tmp_path):
+    path = str(tmp_path / "bucket")
+    a = SharedTokenBucket(path, rate=10, burst=2, now=0)
+    b = SharedTokenBucket(path, rate=10, burst=2, now=0)
+    assert a.take(0) == 0
+    assert b.take(0) == 0
+    assert a.take(0) == pytest.approx(0.1)
+    assert b.take(0.1) == 0
+    a.close()
+    b.close()
+
+
+def test_shared_token_bucket_rejects_other_files(tmp_path):
+    path = tmp_path / "bucket"
+    path.write_bytes(b"\1" * 24)
+    with pytest.raises(ValueError):
+        SharedTokenBucket(str(path), rate=1, burst=1, now=0)
+
+
+def _acquire_shared(path: str) -> None:
+    s = Scheduler(rate=50, burst=1, path=path)
+    for _ in range(5):
+        s.acquire()
+
+
+def test_quota_shared_between_processes(tmp_path):
+    path = str(tmp_path / "bucket")
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_acquire_shared, args=(path,)) for _ in range(4)]
+    start = time.monotonic()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+        assert w.exitcode == 0
+    # 20 calls at 50 per second; per-process buckets would take 80ms.
+    assert time.monotonic() - start >= 0.35
+
+
+def test_rate_limit():
+    s = Scheduler(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        s.acquire()
+    assert time.monotonic() - start >= 0.09
+    assert s.stats()[Priority.INTERACTIVE].admitted == 6
+
+
+def test_interactive_before_bulk():
+    s = Scheduler(rate=20, burst=1)
+    s.acquire()
+    order = []
+
+    def call(p: Priority, name: str) -> None:
+        s.acquire(p)
+        order.append(name)
+
+    bulk = [
+        threading.Thread(target=call, args=(Priority.BULK, f"bulk{i}"))
+        for i in range(3)
+    ]
+    for t in bulk:
+        t.start()
+    while s.stats()[Priority.BULK].depth < 3:
+        time.sleep(0.001)
+    interactive = threading.Thread(target=call, args=(Priority.INTERACTIVE, "ui"))
+    interactive.start()
+    for t in bulk + [interactive]:
+        t.join()
+    assert order[0] == "ui"
+    assert sorted(order[1:]) == ["bulk0", "bulk1", "bulk2"]
+
+
+def test_queue_full():
+    s = Scheduler(rate=5, burst=1, max_queue=1)
+    s.acquire()
+    waiter = threading.Thread(target=lambda: s.acquire(Priority.BULK))
+    waiter.start()
+    while s.stats()[Priority.BULK].depth < 1:
+        time.sleep(0.001)
+    with pytest.raises(QueueFull):
+        s.acquire(Priority.BULK)
+    waiter.join()
+    assert s.stats()[Priority.BULK].rejected == 1
+
+
+def test_deadline_shedding():
+    s = Scheduler(rate=1, burst=1, interactive_timeout=0.1)
+    s.acquire()
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        s.acquire()
+    # The next token is a second away, so the caller is shed right away.
+    assert time.monotonic() - start < 0.05
+    stats = s.stats()[Priority.INTERACTIVE]
+    assert (stats.admitted, stats.shed, stats.depth) == (1, 1, 0)
+
+
+def test_wait_stats():
+    s = Scheduler(rate=100, burst=1)
+    for _ in range(5):
+        s.acquire()
+    stats = s.stats()[Priority.INTERACTIVE]
+    assert 0 < stats.mean_wait <= stats.p95_wait <= stats.max_wait < 0.1
+
+
+def test_priority_context():
+    assert current_priority() == Priority.INTERACTIVE
+    with priority(Priority.BULK):
+        assert current_priority() == Priority.BULK
+    assert current_priority() == Priority.INTERACTIVE
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    s = Scheduler(rate=1000)
+    monkeypatch.setattr(scheduler_module, "_scheduler", None)
+    set_scheduler(s)
+    return s
+
+
+def test_api_call_goes_through_scheduler(fake_transact, installed):
+    validate_aba_routing_number("021000021")
+    with priority(Priority.BULK):
+        items = [{"account": "123", "routing": "021000021"}] * 4
+        validate_many(AchAccount, items, max_workers=2)
+    stats = installed.stats()
+    assert stats[Priority.INTERACTIVE].admitted == 1
+    assert stats[Priority.BULK].admitted == 4
+    assert fake_transact.requests == 5
+
+
+def test_shed_rows_keep_their_slot(fake_transact, monkeypatch):
+    monkeypatch.setattr(scheduler_module, "_scheduler", None)
+    set_scheduler(Scheduler(rate=1, burst=1, interactive_timeout=0.2))
+    items = [{"account": "123", "routing": "021000021"}] * 3
+    results = validate_many(AchAccount, items, max_workers=1)
+    assert isinstance(results[0], AchAccount)
+    assert all(isinstance(r, DeadlineExceeded) for r in results[1:])
+    assert fake_transact.requests == 1
@@ -0,0 +1,140 @@
+import json
+import time
+
+import pytest
+
+from app import bin_table, snapshot, verdicts
+from app.bin_table import build_bin_table
+from app.snapshot import SnapshotInfo
+from app.verdicts import Verdict, VerdictStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(verdicts, "_store", None)
+    monkeypatch.setattr(verdicts, "ROUTING_VERDICT_STORE", None)
+    monkeypatch.setattr(bin_table, "_table", None)
+    monkeypatch.setattr(bin_table, "BIN_TABLE_PATH", None)
+
+
+@pytest.fixture
+def bins(tmp_path):
+    csv_path = tmp_path / "bins.csv"
+    csv_path.write_text(
+        "bin_start,bin_end,issuer,country,card_type\n424242,,Test Bank,US,credit\n"
+    )
+    path = str(tmp_path / "bins.bin")
+    build_bin_table(str(csv_path), path)
+    return path
+
+
+def save_warm_state(path, bins):
+    store = verdicts.load_verdict_store(None, capacity=16)
+    store.put("021000021", Verdict.VALID)
+    store.put("011000015", Verdict.INVALID)
+    bin_table.load_bin_table(bins)
+    snapshot.save_snapshot(path)
+    verdicts._store = None
+    bin_table._table = None
+
+
+def test_round_trip(tmp_path, bins):
+    path = str(tmp_path / "snapshot.json")
+    save_warm_state(path, bins)
+
+    assert snapshot.load_snapshot(path) == SnapshotInfo(2, 0, 0)
+    store = verdicts.get_verdict_store()
+    assert store.get("021000021") == Verdict.VALID
+    assert store.get("011000015") == Verdict.INVALID
+    assert bin_table.get_bin_table().lookup("4242424242424242").issuer == "Test Bank"
+
+
+def test_load_into_configured_store(tmp_path, bins):
+    path = str(tmp_path / "snapshot.json")
+    save_warm_state(path, bins)
+    shared = verdicts.load_verdict_store(str(tmp_path / "verdicts.bin"))
+
+    assert snapshot.load_snapshot(path).loaded == 2
+    assert verdicts.get_verdict_store() is shared
+    assert VerdictStore(shared.path).get("011000015") == Verdict.INVALID
+
+
+def test_changed_bin_table_is_not_loaded(tmp_path, bins):
+    path = str(tmp_path / "snapshot.json")
+    save_warm_state(path, bins)
+    with open(bins, "ab") as f:
+        f.write(b"\0")
+
+    assert snapshot.load_snapshot(path) is not None
+    assert bin_table.get_bin_table() is None
+
+
+def test_missing_or_corrupt_snapshot(tmp_path):
+    path = tmp_path / "snapshot.json"
+    assert snapshot.load_snapshot(str(path)) is None
+    path.write_text("{not json")
+    assert snapshot.load_snapshot(str(path)) is None
+    path.write_text("[]")
+    assert snapshot.load_snapshot(str(path)) is None
+    assert verdicts.get_verdict_store() is None
+
+
+def test_incompatible_snapshot(tmp_path, bins):
+    path = tmp_path / "snapshot.json"
+    save_warm_state(str(path), bins)
+    data = json.loads(path.read_text())
+    data["fingerprint"] = "0" * 64
+    path.write_text(json.dumps(data))
+    assert snapshot.load_snapshot(str(path)) is None
+    assert verdicts.get_verdict_store() is None
+
+
+def test_stale_snapshot(tmp_path, bins):
+    path = tmp_path / "snapshot.json"
+    save_warm_state(str(path), bins)
+    data = json.loads(path.read_text())
+    data["created"] = time.time() - 3600
+    path.write_text(json.dumps(data))
+    assert snapshot.load_snapshot(str(path), max_age=60) is None
+    assert snapshot.load_snapshot(str(path), max_age=None).loaded == 2
+
+
+def test_verdicts_expire_from_when_they_were_learned(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    store = verdicts.load_verdict_store(None, capacity=16)
+    store.put("021000021", Verdict.VALID)
+    store.put("011000015", Verdict.INVALID, learned=time.time() - 3 * 24 * 3600)
+    snapshot.save_snapshot(path)
+
+    # Re-saving from a worker that loaded the snapshot keeps the old times.
+    verdicts._store = None
+    snapshot.load_snapshot(path)
+    snapshot.save_snapshot(path)
+
+    verdicts._store = None
+    info = snapshot.load_snapshot(path, max_age=24 * 3600)
+    assert info == SnapshotInfo(1, 1, 0)
+    assert verdicts.get_verdict_store().get("011000015") is None
+
+
+def test_full_store_reports_dropped_verdicts(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    store = verdicts.load_verdict_store(None, capacity=16)
+    for i in range(10):
+        store.put(f"{i:09d}", Verdict.VALID)
+    snapshot.save_snapshot(path)
+
+    small = verdicts.load_verdict_store(None, capacity=8)
+    small.put("000000000", Verdict.VALID)
+    # 8 slots hold at most 5 entries (see `verdicts.MAX_LOAD`).
+    assert snapshot.load_snapshot(path) == SnapshotInfo(4, 0, 5)
+
+
+def test_snapshot_periodically(tmp_path):
+    path = tmp_path / "snapshot.json"
+    stop = snapshot.snapshot_periodically(str(path), 0.01, at_exit=False)
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop()
+    assert snapshot.load_snapshot(str(path)) is not None
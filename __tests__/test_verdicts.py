@@ -0,0 +1,169 @@
+import multiprocessing
+import subprocess
+import sys
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from app import verdicts
+from app.models import AchAccount
+from app.verdicts import Verdict, VerdictStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = VerdictStore(capacity=64)
+    monkeypatch.setattr(verdicts, "_store", store)
+    yield store
+    store.close()
+
+
+def test_get_put():
+    store = VerdictStore(capacity=8)
+    assert store.get("021000021") is None
+    assert store.put("021000021", Verdict.VALID)
+    assert store.put("011000015", Verdict.INVALID)
+    assert store.get("021000021") == Verdict.VALID
+    assert store.get("011000015") == Verdict.INVALID
+    assert store.put("021000021", Verdict.INVALID)
+    assert store.get("021000021") == Verdict.INVALID
+    assert sorted(store.items()) == [
+        ("011000015", Verdict.INVALID),
+        ("021000021", Verdict.INVALID),
+    ]
+
+
+def test_records_keep_learned_hour():
+    store = VerdictStore(capacity=8)
+    store.put("021000021", Verdict.VALID, learned=7200 * 1000 + 1800)
+    store.put("999999999", Verdict.INVALID)
+    records = dict((n, (v, t)) for n, v, t in store.records())
+    assert records["021000021"] == (Verdict.VALID, 7200.0 * 1000)
+    assert records["999999999"][0] == Verdict.INVALID
+    assert 0 <= time.time() - records["999999999"][1] < 3600
+
+
+def test_malformed_routing_numbers():
+    store = VerdictStore(capacity=8)
+    assert not store.put("12345678", Verdict.VALID)
+    assert not store.put("12345678a", Verdict.VALID)
+    assert store.get("12345678") is None
+
+
+def test_load_limit():
+    store = VerdictStore(capacity=16)
+    for i in range(11):
+        assert store.put(f"{i:09d}", Verdict.VALID)
+    assert not store.put("000000011", Verdict.VALID)
+    assert store.put("000000000", Verdict.INVALID)
+    assert len(store) == 11
+    assert all(store.get(f"{i:09d}") is not None for i in range(11))
+
+
+def test_verdicts_expire():
+    store = VerdictStore(capacity=8, max_age=3600)
+    store.put("021000021", Verdict.VALID, learned=time.time() - 3 * 3600)
+    assert store.get("021000021") is None
+    store.put("021000021", Verdict.VALID)
+    assert store.get("021000021") == Verdict.VALID
+    assert len(store) == 1
+
+
+def test_expired_slots_are_reused():
+    store = VerdictStore(capacity=8, max_age=3600)
+    old = time.time() - 3 * 3600
+    for i in range(5):
+        assert store.put(f"{i:09d}", Verdict.INVALID, learned=old)
+    for i in range(5, 10):
+        assert store.put(f"{i:09d}", Verdict.VALID)
+    assert len(store) == 5
+    verdicts_now = [store.get(f"{i:09d}") for i in range(10)]
+    assert verdicts_now == [None] * 5 + [Verdict.VALID] * 5
+
+
+def test_shared_between_instances(tmp_path):
+    path = str(tmp_path / "verdicts.bin")
+    a, b = VerdictStore(path, capacity=16), VerdictStore(path, capacity=1024)
+    assert b.capacity == 16
+    a.put("021000021", Verdict.VALID)
+    assert b.get("021000021") == Verdict.VALID
+    a.close()
+    b.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "verdicts.bin"
+    path.write_bytes(b"\1" * 64)
+    with pytest.raises(ValueError):
+        VerdictStore(str(path))
+
+
+def test_models_import_without_fcntl():
+    code = "import sys; sys.modules['fcntl'] = None; from app.models import CreditCard"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_private_store_without_fcntl(monkeypatch, tmp_path):
+    monkeypatch.setattr(verdicts, "fcntl", None)
+    store = VerdictStore(capacity=8)
+    assert store.put("021000021", Verdict.VALID)
+    with pytest.raises(RuntimeError):
+        VerdictStore(str(tmp_path / "verdicts.bin"))
+
+
+def _write_verdicts(path: str, worker: int) -> None:
+    store = VerdictStore(path)
+    for i in range(200):
+        store.put(f"{worker:03d}{i:06d}", Verdict(1 + i % 2))
+    store.close()
+
+
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path / "verdicts.bin")
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_write_verdicts, args=(path, n)) for n in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+        assert w.exitcode == 0
+
+    store = VerdictStore(path)
+    assert len(store) == 800
+    for n in range(4):
+        for i in range(200):
+            assert store.get(f"{n:03d}{i:06d}") == Verdict(1 + i % 2)
+    store.close()
+
+
+def test_ach_account_uses_store(fake_transact, store):
+    AchAccount(account="123", routing="021000021")
+    AchAccount(account="456", routing="021000021")
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            AchAccount(account="123", routing="011000015")
+    assert fake_transact.requests == 2
+    assert store.get("021000021") == Verdict.VALID
+    assert store.get("011000015") == Verdict.INVALID
+
+
+def test_unusable_store_file_is_skipped(fake_transact, monkeypatch, tmp_path, caplog):
+    path = tmp_path / "old.store"
+    path.write_bytes(verdicts.HEADER.pack(verdicts.MAGIC, 1, 8, 0) + bytes(64))
+    monkeypatch.setattr(verdicts, "_store", None)
+    monkeypatch.setattr(verdicts, "_unusable", None)
+    monkeypatch.setattr(verdicts, "ROUTING_VERDICT_STORE", str(path))
+    for _ in range(2):
+        AchAccount(account="123", routing="021000021")
+    assert verdicts.get_verdict_store() is None
+    assert fake_transact.requests == 2
+    assert len([r for r in caplog.records if "verdict store" in r.message]) == 1
+
+
+def test_errors_are_not_recorded(monkeypatch, store):
+    monkeypatch.setattr(
+        verdicts, "validate_aba_routing_number", lambda n: {"statusCode": "1400"}
+    )
+    assert verdicts.routing_number_verdict("021000021") is None
+    assert len(store) == 0
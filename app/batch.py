@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel, ValidationError
+
+from app.cache import ValidationCache
+from app.scheduler import SchedulerError, current_priority, priority
+
+Model = TypeVar("Model", bound=BaseModel)
+Result = Union[Model, ValidationError, SchedulerError]
+
+
+def validate_many(
+    model: Type[Model],
+    items: Iterable[Dict[str, Any]],
+    max_workers: int = 8,
+    cache: Optional[ValidationCache] = None,
+) -> List[Result]:
+    """Validates many inputs concurrently on a thread pool.
+
+    Meant for I/O-bound models such as `AchAccount`, whose routing number check
+    waits on Transact API. Each worker thread uses its own HTTP session (see
+    `app.helpers.get_session`), and a shared `ValidationCache` may be passed so
+    that duplicate inputs are only validated once. Transact API calls keep the
+    caller's scheduler priority (see `app.scheduler.priority`); an input whose
+    call the scheduler sheds gets the `SchedulerError` in its slot, so the
+    rest of the batch is still returned.
+
+    Args:
+        model (Type[Model]): Model class
+        items (Iterable[Dict[str, Any]]): Raw model inputs
+        max_workers (int, optional): Thread pool size. Defaults to 8.
+        cache (Optional[ValidationCache], optional): Cache for `model`.
+
+    Returns:
+        List[Result]: Validated model or the `ValidationError` or
+        `SchedulerError` it raised, in input order
+    """
+    parse = model.parse_obj if cache is None else cache.validate
+    lane = current_priority()
+
+    def run(data: Dict[str, Any]) -> Result:
+        try:
+            with priority(lane):
+                return parse(data)
+        except (ValidationError, SchedulerError) as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        return list(pool.map(run, items))
@@ -0,0 +1,278 @@
+"""Local BIN (issuer identification number) range database.
+
+BIN ranges are compiled from a CSV into a compact binary file that is opened
+with a read-only memory map, so every worker process on a host shares the same
+pages. Ranges are keyed on 8 digit prefixes (6 digit BINs cover the 100 eight
+digit prefixes below them) and looked up with a binary search.
+
+CSV columns: `bin_start,bin_end,issuer,country,card_type`, where `bin_end` may
+be empty for a single BIN and `card_type` is one of debit, credit, prepaid.
+
+File layout, little-endian, columns stored back to back:
+    header   magic "BINT", version u8, reserved u8, issuers u16, ranges u32
+    starts   u32 * ranges, sorted
+    ends     u32 * ranges
+    issuer   u16 * ranges, index into the issuer names
+    type     u8 * ranges, index into `CardType`
+    country  2 bytes * ranges, ISO 3166 alpha-2
+    names    per issuer, u8 length + UTF-8 name
+
+Usage:
+    python -m app.bin_table build bins.csv bins.bin
+"""
+
+import csv
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from enum import Enum
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from config import BIN_TABLE_PATH
+
+MAGIC = b"BINT"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHI")
+PREFIX_DIGITS = 8
+# Issuer names are stored with a one-byte length, counted by a u16.
+MAX_ISSUER_BYTES = 255
+MAX_ISSUERS = 0xFFFF
+
+
+class CardType(str, Enum):
+    DEBIT = "debit"
+    CREDIT = "credit"
+    PREPAID = "prepaid"
+
+
+CARD_TYPES = list(CardType)
+
+
+class BinInfo(NamedTuple):
+    issuer: str
+    country: str
+    card_type: CardType
+
+
+def _bounds(start: str, end: str) -> Tuple[int, int]:
+    """Normalizes a 6 or 8 digit BIN range to inclusive 8 digit prefixes."""
+    end = end or start
+    if not (start.isdigit() and end.isdigit()) or len(start) != len(end):
+        raise ValueError(f"Invalid BIN range {start}-{end}.")
+    if len(start) not in (6, PREFIX_DIGITS):
+        raise ValueError(f"BINs must be 6 or 8 digits, got {start}.")
+    pad = PREFIX_DIGITS - len(start)
+    lo, hi = int(start) * 10**pad, (int(end) + 1) * 10**pad - 1
+    if lo > hi:
+        raise ValueError(f"Invalid BIN range {start}-{end}.")
+    return lo, hi
+
+
+def _issuer_name(name: str) -> str:
+    """Strips an issuer name and cuts it to whole characters within 255 bytes."""
+    encoded = name.strip().encode()[:MAX_ISSUER_BYTES]
+    return encoded.decode("utf-8", "ignore")
+
+
+def build_bin_table(csv_path: str, out_path: str) -> int:
+    """Compiles a BIN range CSV into the binary table format.
+
+    The file is written next to `out_path` and renamed into place, so processes
+    that have the previous table mapped keep a consistent view.
+
+    Args:
+        csv_path (str): Source CSV
+        out_path (str): Binary table to write
+
+    Issuer names longer than 255 bytes of UTF-8 are truncated to fit.
+
+    Raises:
+        ValueError: Malformed or overlapping ranges, an unknown card type, or
+        more than 65535 distinct issuers
+
+    Returns:
+        int: Number of ranges written
+    """
+    rows = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            lo, hi = _bounds(row["bin_start"].strip(), row["bin_end"].strip())
+            country = row["country"].strip().upper()
+            if len(country) != 2 or not country.isascii():
+                raise ValueError(f"Invalid country {country!r} for BIN {lo}.")
+            card_type = CardType(row["card_type"].strip().lower())
+            rows.append((lo, hi, _issuer_name(row["issuer"]), country, card_type))
+    rows.sort()
+    for prev, cur in zip(rows, rows[1:]):
+        if cur[0] <= prev[1]:
+            raise ValueError(f"Overlapping BIN ranges at {cur[0]}.")
+
+    issuers = sorted({row[2] for row in rows})
+    if len(issuers) > MAX_ISSUERS:
+        raise ValueError(f"At most {MAX_ISSUERS} issuers fit, got {len(issuers)}.")
+    index = {name: i for i, name in enumerate(issuers)}
+    starts, ends = array("I", (r[0] for r in rows)), array("I", (r[1] for r in rows))
+    issuer_ids = array("H", (index[r[2]] for r in rows))
+    if sys.byteorder == "big":  # pragma: no cover
+        for column in (starts, ends, issuer_ids):
+            column.byteswap()
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(issuers), len(rows)))
+        f.write(starts.tobytes())
+        f.write(ends.tobytes())
+        f.write(issuer_ids.tobytes())
+        f.write(bytes(CARD_TYPES.index(r[4]) for r in rows))
+        f.write(b"".join(r[3].encode("ascii") for r in rows))
+        for name in issuers:
+            encoded = name.encode()
+            f.write(bytes([len(encoded)]) + encoded)
+    os.replace(tmp_path, out_path)
+    return len(rows)
+
+
+class BinTable:
+    """Read-only, memory-mapped BIN range table.
+
+    Args:
+        path (str): Table written by `build_bin_table`
+
+    Raises:
+        ValueError: Not a BIN table, or an unsupported version
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, issuers, n = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} BIN table.")
+
+        self._view = view = memoryview(self._mm)
+        offset = HEADER.size
+        self._starts = self._column(view, offset, n, "I")
+        self._ends = self._column(view, offset + 4 * n, n, "I")
+        self._issuer_ids = self._column(view, offset + 8 * n, n, "H")
+        types, countries, names = offset + 10 * n, offset + 11 * n, offset + 13 * n
+        self._types = view[types:countries]
+        self._countries = view[countries:names]
+
+        self._issuers: List[str] = []
+        pos = names
+        for _ in range(issuers):
+            start, pos = pos + 1, pos + 1 + self._mm[pos]
+            self._issuers.append(self._mm[start:pos].decode())
+
+    @staticmethod
+    def _column(view: memoryview, offset: int, n: int, fmt: str):
+        end = offset + n * array(fmt).itemsize
+        data = view[offset:end]
+        if sys.byteorder == "big":  # pragma: no cover
+            column = array(fmt, data.tobytes())
+            column.byteswap()
+            return column
+        return data.cast(fmt)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def lookup(self, number: str) -> Optional[BinInfo]:
+        """Finds the BIN range a card number falls in.
+
+        Args:
+            number (str): Card number, or at least its first 8 digits
+
+        Returns:
+            Optional[BinInfo]: Issuer metadata, None if no range matches
+        """
+        prefix = number[:PREFIX_DIGITS]
+        if len(prefix) < PREFIX_DIGITS or not prefix.isdigit():
+            return None
+        key = int(prefix)
+        i = bisect_right(self._starts, key) - 1
+        if i < 0 or key > self._ends[i]:
+            return None
+        return BinInfo(
+            self._issuers[self._issuer_ids[i]],
+            chr(self._countries[2 * i]) + chr(self._countries[2 * i + 1]),
+            CARD_TYPES[self._types[i]],
+        )
+
+    def lookup_many(self, numbers: Iterable[str]) -> List[Optional[BinInfo]]:
+        """Looks up many card numbers at once.
+
+        Args:
+            numbers (Iterable[str]): Card numbers
+
+        Returns:
+            List[Optional[BinInfo]]: Metadata per number, in input order
+        """
+        return [self.lookup(number) for number in numbers]
+
+    def close(self) -> None:
+        for column in (
+            self._starts,
+            self._ends,
+            self._issuer_ids,
+            self._types,
+            self._countries,
+            self._view,
+        ):
+            if isinstance(column, memoryview):
+                column.release()
+        self._mm.close()
+
+
+_table: Optional[BinTable] = None
+_table_lock = threading.Lock()
+
+
+def load_bin_table(path: str) -> BinTable:
+    """Opens the table at `path` and makes it the process-wide table.
+
+    Args:
+        path (str): Table written by `build_bin_table`
+
+    Returns:
+        BinTable: The opened table
+    """
+    global _table
+    table = BinTable(path)
+    with _table_lock:
+        _table = table
+    return table
+
+
+def get_bin_table() -> Optional[BinTable]:
+    """Returns the process-wide table.
+
+    Unless `load_bin_table` was called, the table at `BIN_TABLE_PATH` is opened
+    on first use.
+
+    Returns:
+        Optional[BinTable]: None when no table is configured
+    """
+    global _table
+    if _table is None and BIN_TABLE_PATH:
+        with _table_lock:
+            if _table is None:
+                _table = BinTable(BIN_TABLE_PATH)
+    return _table
+
+
+def main() -> None:
+    if len(sys.argv) != 4 or sys.argv[1] != "build":
+        sys.exit("Usage: python -m app.bin_table build <csv> <out>")
+    n = build_bin_table(sys.argv[2], sys.argv[3])
+    print(f"Wrote {n} BIN ranges to {sys.argv[3]}")
+
+
+if __name__ == "__main__":
+    main()
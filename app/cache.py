@@ -0,0 +1,193 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel, ValidationError
+
+Model = TypeVar("Model", bound=BaseModel)
+Entry = Tuple[float, Union[BaseModel, List[Any]]]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def input_key(data: Dict[str, Any]) -> Optional[bytes]:
+    """Hashes a raw model input into a cache key.
+
+    Only the digest is kept, so sensitive values (card numbers, CVVs, account
+    numbers) never sit in the cache as plaintext keys.
+
+    Args:
+        data (Dict[str, Any]): Raw model input
+
+    Returns:
+        Optional[bytes]: Digest of the input, or None if it isn't plain JSON data
+    """
+    try:
+        encoded = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+
+
+class _Stripe:
+    """One independently locked segment of a `ValidationCache`."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[bytes, Entry]" = OrderedDict()
+        self.pending: "Dict[bytes, Future[Entry]]" = {}
+        self.hits = 0
+        self.misses = 0
+
+    def claim(self, key: bytes, now: float) -> "Union[Entry, Future[Entry], None]":
+        """Looks up `key`, or claims the right to validate it.
+
+        Returns:
+            Union[Entry, Future[Entry], None]: The live entry; the future of a
+            validation another thread is running for the same key; or None,
+            in which case the caller must `put` or `fail` the key.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            pending = self.pending.get(key)
+            if pending is not None:
+                self.hits += 1
+                return pending
+            self.misses += 1
+            self.pending[key] = Future()
+            return None
+
+    def put(self, key: bytes, entry: Entry) -> None:
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            pending = self.pending.pop(key)
+        pending.set_result(entry)
+
+    def fail(self, key: bytes, error: BaseException) -> None:
+        with self.lock:
+            pending = self.pending.pop(key)
+        pending.set_exception(error)
+
+
+class ValidationCache(Generic[Model]):
+    """Bounded, expiring cache of validation results for a single model.
+
+    Maps the content hash of a raw input to either the validated model or the
+    errors it raised, so retried payloads skip revalidation. Entries expire
+    after `ttl` seconds, which keeps date-dependent rules such as
+    `CreditCard.validate_year` honest, and the least recently used entry is
+    evicted once `maxsize` is reached.
+
+    The cache is safe to share between threads. Keys are spread over `stripes`
+    independently locked segments (sharing `maxsize` between them),
+    so threads only contend when they hit the same segment, and validation
+    itself always runs outside the locks. Concurrent misses on the same input
+    wait for the first one instead of validating it again.
+    """
+
+    def __init__(
+        self,
+        model: Type[Model],
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+        stripes: int = 1,
+    ):
+        self.model = model
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        if not 1 <= stripes <= maxsize:
+            raise ValueError("stripes must be between 1 and maxsize.")
+        size, extra = divmod(maxsize, stripes)
+        self._stripes = [_Stripe(size + (i < extra)) for i in range(stripes)]
+
+    def validate(self, data: Dict[str, Any]) -> Model:
+        """Validates `data`, reusing a cached result for identical input.
+
+        Args:
+            data (Dict[str, Any]): Raw model input
+
+        Raises:
+            ValidationError: The input (or its cached twin) is invalid
+
+        Returns:
+            Model: A copy of the validated model
+        """
+        key = input_key(data)
+        if key is None:
+            return self.model.parse_obj(data)
+
+        stripe = self._stripes[key[0] % len(self._stripes)]
+        now = self._timer()
+        claimed = stripe.claim(key, now)
+        if isinstance(claimed, Future):
+            claimed = claimed.result()
+        if claimed is not None:
+            return self._unwrap(claimed[1])
+
+        result: Union[BaseModel, List[Any]]
+        try:
+            result = self.model.parse_obj(data)
+        except ValidationError as e:
+            result = e.raw_errors
+        except BaseException as e:
+            stripe.fail(key, e)
+            raise
+        stripe.put(key, (now + self.ttl, result))
+        return self._unwrap(result)
+
+    def _unwrap(self, result: Union[BaseModel, List[Any]]) -> Model:
+        if isinstance(result, BaseModel):
+            return result.copy()
+        raise ValidationError(result, self.model)
+
+    def info(self) -> CacheInfo:
+        hits = misses = currsize = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                hits += stripe.hits
+                misses += stripe.misses
+                currsize += len(stripe.entries)
+        return CacheInfo(hits, misses, self.maxsize, currsize)
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.hits = 0
+                stripe.misses = 0
@@ -0,0 +1,136 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+Model = TypeVar("Model", bound=BaseModel)
+Encoder = Callable[[Any], Any]
+FieldPlan = Tuple[Tuple[str, Optional[Encoder]], ...]
+
+
+def mask(value: Any, visible: int = 4) -> str:
+    """Masks a sensitive value, keeping only the trailing `visible` characters.
+
+    Values no longer than `visible` are masked entirely, so the output never
+    reveals a whole value.
+
+    Args:
+        value (Any): Value to mask
+        visible (int, optional): Trailing characters left readable. Defaults to 4.
+
+    Returns:
+        str: Masked value, e.g. "************4242"
+    """
+    s = str(value)
+    if visible <= 0 or len(s) <= visible:
+        return "*" * len(s)
+    return "*" * (len(s) - visible) + s[-visible:]
+
+
+def _json_dumps(data: Any) -> str:
+    return json.dumps(data, default=pydantic_encoder, separators=(",", ":"))
+
+
+if orjson is not None:
+
+    def _dumps(data: Any) -> str:
+        try:
+            return orjson.dumps(data, default=pydantic_encoder).decode()
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the json module handles.
+            return _json_dumps(data)
+
+    _loads = orjson.loads
+
+else:  # pragma: no cover - exercised only without orjson installed
+    _dumps = _json_dumps
+    _loads = json.loads
+
+
+@lru_cache(maxsize=None)
+def field_plan(model: Type[BaseModel], masked: bool = False) -> FieldPlan:
+    """Precomputes the per-field encoders of a model.
+
+    Fields are emitted as-is unless they are listed in the model's
+    `Config.sensitive_fields` and `masked` is set, in which case they are masked
+    down to the configured number of trailing characters.
+
+    Args:
+        model (Type[BaseModel]): Model class
+        masked (bool, optional): Mask sensitive fields. Defaults to False.
+
+    Returns:
+        FieldPlan: (field name, encoder or None) pairs in declaration order
+    """
+    sensitive: Dict[str, int] = getattr(model.__config__, "sensitive_fields", {})
+    plan = []
+    for name in model.__fields__:
+        encoder: Optional[Encoder] = None
+        if masked and name in sensitive:
+            visible = sensitive[name]
+            encoder = lambda v, visible=visible: mask(v, visible)  # noqa: E731
+        plan.append((name, encoder))
+    return tuple(plan)
+
+
+def dumps(model: BaseModel, *, masked: bool = False) -> str:
+    """Serializes a model to JSON.
+
+    Equivalent to `model.json()` for the models in `app.models`, but skips
+    pydantic's generic `dict()` walk and uses orjson when it is installed.
+
+    Args:
+        model (BaseModel): Model instance
+        masked (bool, optional): Mask sensitive fields. Defaults to False.
+
+    Returns:
+        str: JSON document
+    """
+    values = model.__dict__
+    data = {
+        name: values[name] if encoder is None else encoder(values[name])
+        for name, encoder in field_plan(type(model), masked)
+    }
+    return _dumps(data)
+
+
+def loads(model: Type[Model], data: Union[str, bytes]) -> Model:
+    """Parses a JSON document into a validated model.
+
+    Args:
+        model (Type[Model]): Model class
+        data (Union[str, bytes]): JSON object
+
+    Raises:
+        ValidationError: The document doesn't satisfy the model
+
+    Returns:
+        Model: Validated model instance
+    """
+    return model.parse_obj(_loads(data))
+
+
+def parse_json_many(model: Type[Model], data: Union[str, bytes]) -> List[Model]:
+    """Parses a JSON array or NDJSON stream into validated models.
+
+    Args:
+        model (Type[Model]): Model class
+        data (Union[str, bytes]): JSON array, or one JSON object per line
+
+    Raises:
+        ValidationError: One of the documents doesn't satisfy the model
+
+    Returns:
+        List[Model]: Validated model instances, in input order
+    """
+    stripped = data.lstrip()
+    if stripped[:1] in ("[", b"["):
+        return [model.parse_obj(obj) for obj in _loads(stripped)]
+    return [model.parse_obj(_loads(line)) for line in data.splitlines() if line.strip()]
@@ -0,0 +1,376 @@
+"""Column-wise batch validation over Apache Arrow record batches.
+
+Mirrors the rules of `CreditCard`, `AchAccount` and `Accreditation` with Arrow
+compute kernels, so tables stored as Parquet can be validated without building
+a Python object per row. Each validator returns the input batch with a
+`<field>_valid` mask per validated field, an overall `valid` mask, and derived
+columns (`brand`, `spend_capacity`, `accredited`).
+
+Requires the optional `pyarrow` dependency (`pip install models[arrow]`).
+"""
+
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.helpers import (
+    AMEX_REGEX,
+    DISCOVER_REGEX,
+    MASTERCARD_REGEX,
+    VISA_REGEX,
+    CreditCardBrand,
+)
+from app.models import ACH_ACCOUNT_RULES, CREDIT_CARD_FIELD_RULES
+from app.rules import CHECKSUMS, Rule
+from app.scheduler import Priority, priority
+from app.verdicts import Verdict, routing_number_verdict
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pc = pq = None
+
+BatchValidator = Callable[["pa.RecordBatch"], "pa.RecordBatch"]
+
+# Longest digit string that always fits an int64 when cast.
+_MAX_INT_DIGITS = 18
+
+# Numbers Arrow can cast the same way Python's `float` parses them.
+_NUMBER_PATTERN = r"^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)(e[+-]?[0-9]+)?$|^[+-]?(inf|nan)$"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for columnar validation: pip install models[arrow]"
+        )
+
+
+def _mask(expr: "pa.Array") -> "pa.Array":
+    """Turns nulls (missing values) into failures."""
+    return pc.fill_null(expr, False)
+
+
+def _all(masks: List["pa.Array"]) -> "pa.Array":
+    result = masks[0]
+    for mask in masks[1:]:
+        result = pc.and_(result, mask)
+    return result
+
+
+def _to_int(column: "pa.Array", digits: "pa.Array") -> "pa.Array":
+    """Casts decimal strings to int64 like `int()`, leaving everything else null.
+
+    Arrow only parses ASCII digits, so the (rare) other Unicode decimal strings
+    are converted one by one.
+    """
+    castable = _mask(
+        pc.and_(digits, pc.less_equal(pc.utf8_length(column), _MAX_INT_DIGITS))
+    )
+    ascii_digits = _mask(pc.match_substring_regex(column, "^[0-9]+$"))
+    fast = pc.and_(castable, ascii_digits)
+    values = pc.cast(pc.if_else(fast, column, None), pa.int64())
+    other = pc.and_(castable, pc.invert(ascii_digits))
+    if pc.any(other).as_py():
+        converted = [int(v) for v in pc.filter(column, other).to_pylist()]
+        values = pc.replace_with_mask(values, other, pa.array(converted, pa.int64()))
+    return values
+
+
+def _bounds(
+    values: "pa.Array", low: Optional[int], high: Optional[int]
+) -> List["pa.Array"]:
+    """Masks keeping `values` within `low` and `high`, inclusive."""
+    masks = []
+    if low is not None:
+        masks.append(pc.greater_equal(values, low))
+    if high is not None:
+        masks.append(pc.less_equal(values, high))
+    return masks
+
+
+def rule_mask(column: "pa.Array", rule: Rule) -> "pa.Array":
+    """Evaluates a `Rule` over a string column.
+
+    Args:
+        column (pa.Array): String column
+        rule (Rule): Rule to apply
+
+    Returns:
+        pa.Array: Boolean mask, False for failing or missing values
+    """
+    _require_pyarrow()
+    masks = []
+    digits = pc.utf8_is_decimal(column)
+    ranged = rule.min_value is not None or rule.max_value is not None
+    if ranged or rule.checksum:
+        masks.append(digits)
+    elif rule.digits:
+        masks.append(pc.utf8_is_digit(column))
+    masks += _bounds(pc.utf8_length(column), rule.min_length, rule.max_length)
+    if ranged:
+        masks += _bounds(_to_int(column, digits), rule.min_value, rule.max_value)
+    if rule.pattern is not None:
+        masks.append(pc.match_substring_regex(column, f"^(?:{rule.pattern})$"))
+    if rule.checksum is not None:
+        # No kernel for checksums; they run per value on the other masks' survivors.
+        check = CHECKSUMS[rule.checksum]
+        prior = _mask(_all(masks)).to_pylist()
+        values = column.to_pylist()
+        masks.append(
+            pa.array([ok and check(v) for ok, v in zip(prior, values)], pa.bool_())
+        )
+    if not masks:
+        return _mask(pc.is_valid(column))
+    return _mask(_all(masks))
+
+
+def _column(batch: "pa.RecordBatch", name: str) -> "pa.Array":
+    index = batch.schema.get_field_index(name)
+    if index < 0:
+        return pa.nulls(batch.num_rows, pa.string())
+    return batch.column(index)
+
+
+def _with_columns(
+    batch: "pa.RecordBatch", columns: Dict[str, "pa.Array"]
+) -> "pa.RecordBatch":
+    return pa.RecordBatch.from_arrays(
+        batch.columns + list(columns.values()),
+        names=batch.schema.names + list(columns),
+    )
+
+
+def credit_card_brands(numbers: "pa.Array") -> "pa.Array":
+    """Column-wise `credit_card_brand`, null where no brand matches."""
+    _require_pyarrow()
+    brands = [
+        (VISA_REGEX, CreditCardBrand.VISA),
+        (DISCOVER_REGEX, CreditCardBrand.DISCOVER),
+        (MASTERCARD_REGEX, CreditCardBrand.MASTERCARD),
+        (AMEX_REGEX, CreditCardBrand.AMERICAN_EXPRESS),
+    ]
+    conditions = pc.make_struct(
+        *[_mask(pc.match_substring_regex(numbers, r.pattern)) for r, _ in brands],
+        field_names=[b.name for _, b in brands],
+    )
+    return pc.case_when(conditions, *[b.value for _, b in brands])
+
+
+def validate_credit_cards(
+    batch: "pa.RecordBatch", today: Optional[date] = None
+) -> "pa.RecordBatch":
+    """Validates a batch of `CreditCard` rows column-wise.
+
+    Args:
+        batch (pa.RecordBatch): Columns name, number, month, year, cvv
+        today (Optional[date], optional): Reference date for the expiry year.
+        Defaults to today.
+
+    Returns:
+        pa.RecordBatch: Input columns plus masks and `brand`
+    """
+    _require_pyarrow()
+    current_year = (today or date.today()).year
+    name, number, year = (_column(batch, f) for f in ("name", "number", "year"))
+    stripped = pc.utf8_trim_whitespace(number)
+    brand = credit_card_brands(number)
+
+    amex = _mask(pc.equal(brand, CreditCardBrand.AMERICAN_EXPRESS.value))
+    year_digits = pc.utf8_is_decimal(year)
+    year_value = _to_int(year, year_digits)
+    masks = {
+        "name_valid": _mask(
+            pc.and_(
+                pc.utf8_is_alpha(name),
+                pc.greater(pc.utf8_length(pc.utf8_trim_whitespace(name)), 1),
+            )
+        ),
+        "number_valid": _mask(
+            _all(
+                [
+                    pc.utf8_is_digit(stripped),
+                    pc.or_(pc.equal(pc.utf8_length(stripped), 16), amex),
+                ]
+            )
+        ),
+        "month_valid": rule_mask(
+            _column(batch, "month"), CREDIT_CARD_FIELD_RULES["month"]
+        ),
+        "year_valid": _mask(
+            _all(
+                [
+                    year_digits,
+                    pc.greater_equal(year_value, current_year),
+                    pc.less_equal(year_value, current_year + 10),
+                ]
+            )
+        ),
+        "cvv_valid": rule_mask(_column(batch, "cvv"), CREDIT_CARD_FIELD_RULES["cvv"]),
+    }
+    return _with_columns(
+        batch, dict(masks, valid=_all(list(masks.values())), brand=brand)
+    )
+
+
+def validate_ach_accounts(
+    batch: "pa.RecordBatch",
+    verify_routing: bool = True,
+    lane: Priority = Priority.BULK,
+) -> "pa.RecordBatch":
+    """Validates a batch of `AchAccount` rows column-wise.
+
+    Routing numbers that pass the local checks are verified with Transact API
+    once per distinct number, not once per row.
+
+    Args:
+        batch (pa.RecordBatch): Columns account, routing
+        verify_routing (bool, optional): Verify routing numbers with Transact
+        API. Defaults to True.
+        lane (Priority, optional): Scheduler lane for those calls (see
+        `app.scheduler`). Defaults to BULK.
+
+    Returns:
+        pa.RecordBatch: Input columns plus masks
+    """
+    _require_pyarrow()
+    routing = _column(batch, "routing")
+    masks = {
+        "account_valid": rule_mask(
+            _column(batch, "account"), ACH_ACCOUNT_RULES["account"]
+        ),
+        "routing_valid": rule_mask(routing, ACH_ACCOUNT_RULES["routing"]),
+    }
+    if verify_routing:
+        candidates = pc.unique(pc.filter(routing, masks["routing_valid"]))
+        with priority(lane):
+            rejected = [
+                num
+                for num in candidates.to_pylist()
+                if routing_number_verdict(num) == Verdict.INVALID
+            ]
+        if rejected:
+            masks["routing_valid"] = pc.and_(
+                masks["routing_valid"],
+                pc.invert(pc.is_in(routing, pa.array(rejected, pa.string()))),
+            )
+    return _with_columns(batch, dict(masks, valid=_all(list(masks.values()))))
+
+
+def _parse_amount(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return float("nan")
+
+
+def _amount(batch: "pa.RecordBatch", name: str) -> "pa.Array":
+    """Reads an amount column like pydantic's `Union[int, float]` field does.
+
+    Missing values default to zero. Numbers are truncated, as pydantic's int
+    branch does, but strings such as "50000.5" fail that branch and keep their
+    fraction. Strings that aren't numbers read as NaN, which fails the `>= 0`
+    checks, so a bad value invalidates its row instead of the whole batch.
+    Amounts stay float64 because valid values can be far outside the int64
+    range.
+    """
+    column = _column(batch, name)
+    if not pa.types.is_string(column.type):
+        return pc.fill_null(pc.trunc(pc.cast(column, pa.float64(), safe=False)), 0.0)
+
+    # Arrow parses plain ASCII numbers; the rest (whitespace, "1_000",
+    # non-ASCII digits, garbage) go through `float()` one by one.
+    fast = _mask(pc.match_substring_regex(column, _NUMBER_PATTERN, ignore_case=True))
+    values = pc.cast(pc.if_else(fast, column, None), pa.float64())
+    slow = pc.and_(pc.is_valid(column), pc.invert(fast))
+    if pc.any(slow).as_py():
+        parsed = [_parse_amount(v) for v in pc.filter(column, slow).to_pylist()]
+        values = pc.replace_with_mask(values, slow, pa.array(parsed, pa.float64()))
+    return pc.fill_null(values, 0.0)
+
+
+def validate_accreditations(batch: "pa.RecordBatch") -> "pa.RecordBatch":
+    """Validates a batch of `Accreditation` rows column-wise.
+
+    Args:
+        batch (pa.RecordBatch): Columns annual_income, net_worth
+
+    Returns:
+        pa.RecordBatch: Input columns plus masks, `accredited` and
+        `spend_capacity` (null for invalid rows)
+    """
+    _require_pyarrow()
+    income, worth = _amount(batch, "annual_income"), _amount(batch, "net_worth")
+    masks = {
+        "annual_income_valid": pc.greater_equal(income, 0),
+        "net_worth_valid": pc.greater_equal(worth, 0),
+    }
+
+    valid = _all(list(masks.values()))
+
+    # Same formula as `spend_pool`.
+    choice = pc.min_element_wise(income, worth)
+    spend = pc.if_else(
+        pc.less(choice, 107_000),
+        pc.max_element_wise(pc.multiply(choice, 0.05), 2200.0),
+        pc.min_element_wise(pc.multiply(choice, 0.1), 107_000.0),
+    )
+    accredited = pc.and_(
+        pc.greater_equal(income, 200_000), pc.greater_equal(worth, 1_000_000)
+    )
+    return _with_columns(
+        batch,
+        dict(
+            masks,
+            valid=valid,
+            accredited=pc.if_else(valid, accredited, None),
+            spend_capacity=pc.if_else(valid, spend, None),
+        ),
+    )
+
+
+def iter_validated(
+    source: str, validator: BatchValidator, batch_size: int = 65_536
+) -> Iterator["pa.RecordBatch"]:
+    """Streams validated batches from a Parquet file, row group by row group.
+
+    Args:
+        source (str): Parquet file
+        validator (BatchValidator): e.g. `validate_credit_cards`
+        batch_size (int, optional): Rows per batch. Defaults to 65_536.
+
+    Yields:
+        pa.RecordBatch: Validated batches
+    """
+    _require_pyarrow()
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+        yield validator(batch)
+
+
+def validate_parquet(
+    source: str, dest: str, validator: BatchValidator, batch_size: int = 65_536
+) -> int:
+    """Validates a Parquet file into another, without materializing it.
+
+    Args:
+        source (str): Parquet file to read
+        dest (str): Parquet file to write, with the validator's extra columns
+        validator (BatchValidator): e.g. `validate_accreditations`
+        batch_size (int, optional): Rows per batch. Defaults to 65_536.
+
+    Returns:
+        int: Number of rows written
+    """
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_validated(source, validator, batch_size):
+            if writer is None:
+                writer = pq.ParquetWriter(dest, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
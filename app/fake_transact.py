@@ -0,0 +1,175 @@
+"""Local stand-in for the Transact API, for tests and load tests.
+
+Only `validateABARoutingnumber` is implemented. Point `TRANSACT_API_BASE_URL`
+(or `app.helpers.TRANSACT_API_BASE_URL`) at `FakeTransactServer.url` to use it.
+
+Usage:
+    python -m app.fake_transact --port 8000 --latency 0.05 --invalid-rate 0.1
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app.rules import aba_checksum
+
+VALID = {"statusCode": "101", "statusDesc": "Ok"}
+INVALID = {"statusCode": "215", "statusDesc": "Invalid routing number"}
+ERROR = {"statusCode": "1400", "statusDesc": "Internal server error"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.fake.record_connection()
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        status, body = self.server.fake.respond(
+            self.path.rsplit("/", 1)[-1],
+            {k: v[0] for k, v in form.items()},
+        )
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeTransactServer"
+
+
+class FakeTransactServer:
+    """Threaded HTTP server answering like Transact API.
+
+    Args:
+        host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+        port (int, optional): Port to bind, 0 picks a free one. Defaults to 0.
+        latency (float, optional): Seconds to wait before answering. Defaults to 0.
+        error_rate (float, optional): Fraction of requests answered with an HTTP
+        500. Defaults to 0.
+        invalid_rate (float, optional): Fraction of otherwise valid routing
+        numbers answered with a "215". Defaults to 0.
+        invalid_routing (Iterable[str], optional): Routing numbers always
+        answered with a "215". Numbers failing the ABA checksum always are.
+        seed (Optional[int], optional): Seed for the error/invalid draws.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        invalid_rate: float = 0.0,
+        invalid_routing: Iterable[str] = (),
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.invalid_rate = invalid_rate
+        self.invalid_routing = frozenset(invalid_routing)
+        self.requests = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def respond(
+        self, endpoint: str, form: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str]]:
+        """Builds the status and JSON body for a single request."""
+        with self._lock:
+            self.requests += 1
+            error = self._random.random() < self.error_rate
+            invalid = self._random.random() < self.invalid_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if error:
+            return 500, ERROR
+        if endpoint != "validateABARoutingnumber":
+            return 404, {"statusCode": "404", "statusDesc": "Unknown endpoint"}
+        routing = form.get("routingNumber", "")
+        if invalid or routing in self.invalid_routing or not aba_checksum(routing):
+            return 200, INVALID
+        return 200, dict(VALID, accountDetails=routing)
+
+    def serve_forever(self) -> None:
+        """Serves requests on the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever(poll_interval=0.05)
+        finally:
+            self._httpd.server_close()
+
+    def start(self) -> "FakeTransactServer":
+        """Serves requests from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeTransactServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-routing", nargs="*", default=())
+    args = parser.parse_args()
+
+    server = FakeTransactServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        invalid_rate=args.invalid_rate,
+        invalid_routing=args.invalid_routing,
+    )
+    print(f"Serving fake Transact API on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
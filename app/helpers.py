@@ -1,11 +1,27 @@
 import re
+import threading
 from enum import Enum
 from typing import Any, Optional, Protocol, Union
 
 import requests
 from pydantic import BaseModel
 
-from config import CLIENT_ID, DEVELOPER_API_KEY
+from app.scheduler import current_priority, get_scheduler
+from config import CLIENT_ID, DEVELOPER_API_KEY, TRANSACT_API_BASE_URL
+
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """Returns the calling thread's HTTP session.
+
+    Sessions pool keep-alive connections but aren't safe to share between
+    threads, so each thread gets its own and reuses it for every call.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
 
 
 class APIPayload(BaseModel):
@@ -23,17 +39,28 @@ class APIResponse(Protocol):
 def api_call(method: str, endpoint: str, payload: Any = None):
     """Runs an API call to Transact API
 
+    Requests go to `TRANSACT_API_BASE_URL`, which can be pointed at a local
+    stand-in such as `app.fake_transact.FakeTransactServer`.
+
+    When a scheduler is configured (see `app.scheduler`), the call first waits
+    for admission in the current priority lane.
+
     Args:
         method (str): HTTP method
         endpoint (str): url endpoint (see documentation)
         payload (Dict[str, Union[str, int, float]], optional): Data payload.
         Defaults to None.
 
+    Raises:
+        SchedulerError: The scheduler shed the call (queue full or deadline)
+
     Returns:
         [Any]: JSON response from the Transact API servers
     """
-    url = "https://api.norcapsecurities.com/tapiv3/index.php/v3/"
-    r = requests.request(method, url + endpoint, data=payload)
+    scheduler = get_scheduler()
+    if scheduler is not None:
+        scheduler.acquire(current_priority())
+    r = get_session().request(method, TRANSACT_API_BASE_URL + endpoint, data=payload)
     return r.json()
 
 
@@ -81,6 +108,14 @@ def spend_pool(
         return maximum if choice * 0.1 >= maximum else choice * 0.1
 
 
+VISA_REGEX = re.compile(r"^4[0-9]{12}(?:[0-9]{3})?$")
+DISCOVER_REGEX = re.compile(r"^6(?:011|5[0-9]{2})[0-9]{12}$")
+MASTERCARD_REGEX = re.compile(
+    r"^(?:5[1-5][0-9]{2}|222[1-9]|22[3-9][0-9]|2[3-6][0-9]{2}|27[01][0-9]|2720)[0-9]{12}$"  # noqa E501
+)
+AMEX_REGEX = re.compile(r"^3[47][0-9]{13}$")
+
+
 class CreditCardBrand(str, Enum):
     VISA = "VI"
     MASTERCARD = "MC"
@@ -100,18 +135,13 @@ def credit_card_brand(n: str) -> CreditCardBrand:
     Returns:
         str: One of the following: "VI", "DI", "MC", "AM"
     """
-    visa_regex = r"^4[0-9]{12}(?:[0-9]{3})?$"
-    discover_regex = r"^6(?:011|5[0-9]{2})[0-9]{12}$"
-    mastercard_regex = r"^(?:5[1-5][0-9]{2}|222[1-9]|22[3-9][0-9]|2[3-6][0-9]{2}|27[01][0-9]|2720)[0-9]{12}$"  # noqa E501
-    amex_regex = r"^3[47][0-9]{13}$"
-
-    if re.match(visa_regex, n):
+    if VISA_REGEX.match(n):
         return CreditCardBrand.VISA
-    elif re.match(discover_regex, n):
+    elif DISCOVER_REGEX.match(n):
         return CreditCardBrand.DISCOVER
-    elif re.match(mastercard_regex, n):
+    elif MASTERCARD_REGEX.match(n):
         return CreditCardBrand.MASTERCARD
-    elif re.match(amex_regex, n):
+    elif AMEX_REGEX.match(n):
         return CreditCardBrand.AMERICAN_EXPRESS
     else:
         raise ValueError("Invalid credit card number.")
@@ -0,0 +1,171 @@
+"""Field-level incremental validation for live form input.
+
+`FormValidator` checks only the fields whose value changed since the last
+update and remembers recent results per field, so per-keystroke validation
+costs one field's validators instead of a whole model.
+
+Fields listed in a model's `Config.deferred_fields` have an expensive check,
+such as `AchAccount.routing` calling Transact API. Each keystroke only runs the
+cheap `Rule` mapped to them; the full validation runs once the value passes
+that rule and has stayed unchanged for `stable_after` seconds (see `poll`), or
+on `flush`.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, NamedTuple, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.rules import Check, Rule, compile_rule
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# Recent results kept per field, so retyping a previous value is free.
+RESULTS_PER_FIELD = 32
+
+
+class FieldResult(NamedTuple):
+    value: Any
+    error: Optional[str] = None
+    pending: bool = False
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None and not self.pending
+
+
+class FormValidator(Generic[Model]):
+    """Validates a model's fields one at a time as a form is filled in.
+
+    Args:
+        model (Type[Model]): Model class
+        stable_after (float, optional): Seconds a deferred field must stay
+        unchanged before its full validation runs. Defaults to 0.5.
+        timer (Callable[[], float], optional): Clock. Defaults to time.monotonic.
+    """
+
+    def __init__(
+        self,
+        model: Type[Model],
+        stable_after: float = 0.5,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.model = model
+        self.stable_after = stable_after
+        self._timer = timer
+        deferred: Dict[str, Rule] = getattr(model.__config__, "deferred_fields", {})
+        self._deferred: Dict[str, Check] = {
+            name: compile_rule(rule) for name, rule in deferred.items()
+        }
+        self._results: Dict[str, FieldResult] = {}
+        self._raw: Dict[str, Any] = {}
+        self._changed_at: Dict[str, float] = {}
+        self._memo: Dict[str, "OrderedDict[Any, FieldResult]"] = {
+            name: OrderedDict() for name in model.__fields__
+        }
+
+    @property
+    def results(self) -> Dict[str, FieldResult]:
+        """Latest result per field that has been given a value."""
+        return dict(self._results)
+
+    def update(self, **changes: Any) -> Dict[str, FieldResult]:
+        """Validates the fields in `changes` whose value actually changed.
+
+        Raises:
+            KeyError: A field doesn't exist on the model
+
+        Returns:
+            Dict[str, FieldResult]: Latest result per field
+        """
+        now = self._timer()
+        for name, value in changes.items():
+            if name not in self._memo:
+                raise KeyError(f"{self.model.__name__} has no field {name!r}.")
+            if name in self._raw and self._raw[name] == value:
+                continue
+            self._raw[name] = value
+            self._changed_at[name] = now
+            self._results[name] = self._check(name, value, full=False)
+        return self.poll()
+
+    def poll(self) -> Dict[str, FieldResult]:
+        """Runs the full validation of deferred fields that have settled.
+
+        Returns:
+            Dict[str, FieldResult]: Latest result per field
+        """
+        now = self._timer()
+        for name, result in self._results.items():
+            if result.pending and now - self._changed_at[name] >= self.stable_after:
+                self._results[name] = self._check(name, self._raw[name], full=True)
+        return self.results
+
+    def flush(self) -> Dict[str, FieldResult]:
+        """Runs the full validation of every pending field right away.
+
+        Returns:
+            Dict[str, FieldResult]: Latest result per field
+        """
+        for name, result in self._results.items():
+            if result.pending:
+                self._results[name] = self._check(name, self._raw[name], full=True)
+        return self.results
+
+    def build(self) -> Optional[Model]:
+        """Builds the model once every field is valid, without revalidating.
+
+        Returns:
+            Optional[Model]: The model, or None while any field is invalid,
+            pending or missing
+        """
+        values = {}
+        for name, field in self.model.__fields__.items():
+            result = self._results.get(name)
+            if result is None and not field.required:
+                continue
+            if result is None or not result.valid:
+                return None
+            values[name] = result.value
+        return self.model.construct(**values)
+
+    def _check(self, name: str, value: Any, full: bool) -> FieldResult:
+        memo = self._memo[name]
+        try:
+            cached = memo.get(value)
+        except TypeError:  # unhashable value, never memoized
+            cached = None
+        if cached is not None:
+            memo.move_to_end(value)
+            return cached
+
+        quick = self._deferred.get(name)
+        if quick is not None and not full:
+            try:
+                quick(value)
+            except ValueError as e:
+                return self._remember(name, value, FieldResult(value, str(e)))
+            except (AttributeError, TypeError):
+                full = True  # not a string; let pydantic report it
+            if not full and self.stable_after > 0:
+                return FieldResult(value, pending=True)
+
+        values = {k: r.value for k, r in self._results.items() if k != name and r.valid}
+        field = self.model.__fields__[name]
+        validated, errors = field.validate(value, values, loc=name, cls=self.model)
+        if errors:
+            message = ValidationError([errors], self.model).errors()[0]["msg"]
+            return self._remember(name, value, FieldResult(value, message))
+        return self._remember(name, value, FieldResult(validated))
+
+    def _remember(self, name: str, key: Any, result: FieldResult) -> FieldResult:
+        memo = self._memo[name]
+        try:
+            memo[key] = result
+        except TypeError:
+            return result
+        memo.move_to_end(key)
+        while len(memo) > RESULTS_PER_FIELD:
+            memo.popitem(last=False)
+        return result
@@ -1,14 +1,39 @@
 from datetime import date
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel, EmailStr, validator
 
+from app.bin_table import BinInfo, get_bin_table
 from app.helpers import (
     CreditCardBrand,
     credit_card_brand,
     spend_pool,
-    validate_aba_routing_number,
 )
+from app.rules import Rule, compile_rule
+from app.verdicts import Verdict, routing_number_verdict
+
+# Only the credit card fields a `Rule` fully describes. `name`, `number` and
+# `year` (Amex length, year relative to today) are checked by `CreditCard`
+# alone, so `compile_schema(CREDIT_CARD_FIELD_RULES)` is a partial check.
+CREDIT_CARD_FIELD_RULES = {
+    "month": Rule("Must be between 1 and 12.", min_value=1, max_value=12),
+    "cvv": Rule("Must be a 3 digit number.", digits=True, min_length=3, max_length=3),
+}
+
+ACH_ACCOUNT_RULES = {
+    "account": Rule(
+        "Must be between 3 and 17 digits.", digits=True, min_length=3, max_length=17
+    ),
+    "routing": Rule(
+        "Accepted routing numbers must be exactly 9 digits.",
+        digits=True,
+        min_length=9,
+        max_length=9,
+    ),
+}
+
+_credit_card_checks = {k: compile_rule(v) for k, v in CREDIT_CARD_FIELD_RULES.items()}
+_ach_account_checks = {k: compile_rule(v) for k, v in ACH_ACCOUNT_RULES.items()}
 
 
 class NewsletterSubscriptionSchema(BaseModel):
@@ -32,6 +57,9 @@ class CreditCard(BaseModel):
     year: str
     cvv: str
 
+    class Config:
+        sensitive_fields = {"number": 4, "cvv": 0}
+
     @property
     def brand(cls) -> CreditCardBrand:
         """Checks the credit card number, returns the brand it's from.
@@ -41,6 +69,17 @@ class CreditCard(BaseModel):
         """
         return credit_card_brand(cls.number)
 
+    @property
+    def bin_info(cls) -> Optional[BinInfo]:
+        """Looks up the card's issuer, country and type in the local BIN table.
+
+        Returns:
+            Optional[BinInfo]: None if no BIN table is configured, or the number
+            isn't in it
+        """
+        table = get_bin_table()
+        return table.lookup(cls.number) if table is not None else None
+
     @validator("name")
     def validate_name(cls, name: str) -> str:
         """Validates cardholder name
@@ -77,8 +116,7 @@ class CreditCard(BaseModel):
             - Must be a number string.
             - Must be between 1 and 12.
         """
-        assert month.isdigit() and 1 <= int(month) <= 12, "Must be between 1 and 12."
-        return month
+        return _credit_card_checks["month"](month)
 
     @validator("year")
     def validate_year(cls, year: str) -> str:
@@ -102,8 +140,7 @@ class CreditCard(BaseModel):
             - Must be a number string.
             - Must be at least 3 digits.
         """
-        assert cvv.isdigit() and len(cvv) == 3, "Must be a 3 digit number."
-        return cvv
+        return _credit_card_checks["cvv"](cvv)
 
 
 class AchAccount(BaseModel):
@@ -112,6 +149,12 @@ class AchAccount(BaseModel):
     account: str
     routing: str
 
+    class Config:
+        sensitive_fields = {"account": 4}
+        # Checked cheaply per keystroke by `app.incremental.FormValidator`,
+        # which defers the Transact API call until the value settles.
+        deferred_fields = {"routing": ACH_ACCOUNT_RULES["routing"]}
+
     @validator("account")
     def validate_account_number(cls, num: str) -> str:
         """Validate the account number input.
@@ -120,8 +163,7 @@ class AchAccount(BaseModel):
             - Must be a number string.
             - Must be between 3 and 17 digits.
         """
-        assert num.isdigit() and 3 <= len(num) <= 17, "Must be between 3 and 17 digits."
-        return num
+        return _ach_account_checks["account"](num)
 
     @validator("routing")
     def validate_routing_number(cls, num: str) -> str:
@@ -131,11 +173,8 @@ class AchAccount(BaseModel):
             - Must be a number string.
             - Must be exactly 9 digits.
         """
-        assert (
-            num.isdigit() and len(num) == 9
-        ), "Accepted routing numbers must be exactly 9 digits."
-        r = validate_aba_routing_number(num)
-        if r.get("statusCode") == "215":
+        _ach_account_checks["routing"](num)
+        if routing_number_verdict(num) == Verdict.INVALID:
             raise ValueError("Invalid routing number")
         return num
 
@@ -0,0 +1,183 @@
+"""Declarative field rules compiled into straight-line validator functions.
+
+A `Rule` describes the checks a string field must pass. `compile_rule` turns it
+into a plain function with every check inlined, and `compile_schema` does the
+same for a whole record, so bulk paths can validate without building models.
+Both are cached, so compiling the same rule twice returns the same function.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+Check = Callable[[str], str]
+RecordCheck = Callable[[Mapping[str, Any]], Dict[str, str]]
+
+
+def luhn_checksum(number: str) -> bool:
+    """Checks a card number against the Luhn (mod 10) algorithm.
+
+    Args:
+        number (str): Digit string
+
+    Returns:
+        bool: Whether the check digit is consistent
+    """
+    total = 0
+    for i, c in enumerate(reversed(number)):
+        d = ord(c) - 48
+        if i % 2:
+            d = d * 2 - 9 if d > 4 else d * 2
+        total += d
+    return total % 10 == 0
+
+
+def aba_checksum(routing_number: str) -> bool:
+    """Checks the ABA routing number check digit.
+
+    Args:
+        routing_number (str): 9 digit routing number
+
+    Returns:
+        bool: Whether the check digit is consistent
+    """
+    if len(routing_number) != 9 or not routing_number.isdigit():
+        return False
+    d = [int(c) for c in routing_number]
+    total = 3 * (d[0] + d[3] + d[6]) + 7 * (d[1] + d[4] + d[7]) + d[2] + d[5] + d[8]
+    return total % 10 == 0
+
+
+CHECKSUMS: Dict[str, Callable[[str], bool]] = {
+    "luhn": luhn_checksum,
+    "aba": aba_checksum,
+}
+
+
+class Rule(NamedTuple):
+    """Checks a string field must pass, all reported with a single message.
+
+    Args:
+        message (str): Error message when any check fails
+        digits (bool, optional): Must be a digit string (`str.isdigit`). A
+        value range or a checksum implies decimal digits. Defaults to False.
+        min_length (Optional[int], optional): Minimum length, inclusive.
+        max_length (Optional[int], optional): Maximum length, inclusive.
+        min_value (Optional[int], optional): Minimum numeric value, inclusive.
+        max_value (Optional[int], optional): Maximum numeric value, inclusive.
+        pattern (Optional[str], optional): Regex the whole value must match.
+        checksum (Optional[str], optional): One of `CHECKSUMS`, e.g. "luhn".
+    """
+
+    message: str
+    digits: bool = False
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    min_value: Optional[int] = None
+    max_value: Optional[int] = None
+    pattern: Optional[str] = None
+    checksum: Optional[str] = None
+
+
+def _bounds(expr: str, low: Optional[int], high: Optional[int]) -> List[str]:
+    """Builds the expressions keeping `expr` within `low` and `high`, inclusive."""
+    if low is not None and low == high:
+        return [f"{expr} == {low!r}"]
+    if low is not None and high is not None:
+        return [f"{low!r} <= {expr} <= {high!r}"]
+    if low is not None:
+        return [f"{expr} >= {low!r}"]
+    if high is not None:
+        return [f"{expr} <= {high!r}"]
+    return []
+
+
+def _conditions(rule: Rule, name: str, namespace: Dict[str, Any]) -> List[str]:
+    """Builds the boolean expressions for `rule` applied to variable `name`."""
+    ranged = rule.min_value is not None or rule.max_value is not None
+    conditions = []
+    # Like the model validators: digits are `str.isdigit`, but values that are
+    # converted with `int()` must be decimal.
+    if ranged or rule.checksum:
+        conditions.append(f"{name}.isdecimal()")
+    elif rule.digits:
+        conditions.append(f"{name}.isdigit()")
+    conditions += _bounds(f"len({name})", rule.min_length, rule.max_length)
+    conditions += _bounds(f"int({name})", rule.min_value, rule.max_value)
+    if rule.pattern is not None:
+        key = f"_pattern_{len(namespace)}"
+        namespace[key] = re.compile(rule.pattern)
+        conditions.append(f"{key}.fullmatch({name}) is not None")
+    if rule.checksum is not None:
+        key = f"_checksum_{len(namespace)}"
+        try:
+            namespace[key] = CHECKSUMS[rule.checksum]
+        except KeyError:
+            raise ValueError(f"Unknown checksum {rule.checksum!r}.") from None
+        conditions.append(f"{key}({name})")
+    return conditions or ["True"]
+
+
+def _build(source: str, namespace: Dict[str, Any], name: str) -> Callable:
+    exec(compile(source, f"<rule {name}>", "exec"), namespace)
+    fn = namespace[name]
+    fn.__source__ = source
+    return fn
+
+
+@lru_cache(maxsize=None)
+def compile_rule(rule: Rule) -> Check:
+    """Generates a validator function for a single rule.
+
+    Args:
+        rule (Rule): Rule to compile
+
+    Raises:
+        ValueError: The rule names an unknown checksum
+
+    Returns:
+        Check: Function returning the value unchanged, or raising `ValueError`
+        with `rule.message`
+    """
+    namespace: Dict[str, Any] = {"_message": rule.message}
+    condition = " and ".join(_conditions(rule, "value", namespace))
+    source = (
+        "def check(value):\n"
+        f"    if not ({condition}):\n"
+        "        raise ValueError(_message)\n"
+        "    return value\n"
+    )
+    return _build(source, namespace, "check")
+
+
+@lru_cache(maxsize=None)
+def _compile_schema(schema: Tuple[Tuple[str, Rule], ...]) -> RecordCheck:
+    namespace: Dict[str, Any] = {}
+    lines = ["def check_record(data):", "    errors = {}"]
+    for i, (field, rule) in enumerate(schema):
+        namespace[f"_message_{i}"] = rule.message
+        condition = " and ".join(_conditions(rule, "value", namespace))
+        lines += [
+            f"    value = data.get({field!r})",
+            "    if value is None:",
+            f"        errors[{field!r}] = 'field required'",
+            "    elif not isinstance(value, str):",
+            f"        errors[{field!r}] = 'str type expected'",
+            f"    elif not ({condition}):",
+            f"        errors[{field!r}] = _message_{i}",
+        ]
+    lines.append("    return errors")
+    return _build("\n".join(lines) + "\n", namespace, "check_record")
+
+
+def compile_schema(schema: Mapping[str, Rule]) -> RecordCheck:
+    """Generates a validator function for a whole record.
+
+    Args:
+        schema (Mapping[str, Rule]): Rule per field name
+
+    Returns:
+        RecordCheck: Function returning an error message per failing field (empty
+        when the record is valid)
+    """
+    return _compile_schema(tuple(schema.items()))
@@ -0,0 +1,346 @@
+"""Quota-aware admission control for Transact API calls.
+
+A `Scheduler` hands out tokens from a token bucket sized to the provider's
+rate limit. Callers wait in one FIFO lane per `Priority`, and a waiting
+interactive call is always admitted before any bulk call. Lanes are bounded
+(`QueueFull`) and callers that can't be admitted before their deadline are shed
+(`DeadlineExceeded`) instead of piling up behind the quota.
+
+Once installed with `set_scheduler` (or configured with
+`TRANSACT_API_RATE_LIMIT`), every `api_call` goes through it, in the lane set
+by the `priority` context manager (interactive by default):
+
+    with priority(Priority.BULK):
+        validate_many(AchAccount, rows)
+
+The quota is the provider's, not a process's: with several workers per host,
+set `TRANSACT_API_RATE_LIMIT_FILE` (or pass `path`) so that they all draw from
+one `SharedTokenBucket`.
+"""
+
+import contextvars
+import os
+import struct
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Deque, Dict, Iterator, List, NamedTuple, Optional
+
+from config import TRANSACT_API_RATE_LIMIT, TRANSACT_API_RATE_LIMIT_FILE
+
+# Wait times kept per lane for the percentile in `Scheduler.stats`.
+WAIT_SAMPLES = 1024
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 1
+
+
+class SchedulerError(Exception):
+    pass
+
+
+class QueueFull(SchedulerError):
+    pass
+
+
+class DeadlineExceeded(SchedulerError):
+    pass
+
+
+class LaneStats(NamedTuple):
+    depth: int
+    admitted: int
+    shed: int
+    rejected: int
+    mean_wait: float
+    p95_wait: float
+    max_wait: float
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second.
+
+    Args:
+        rate (float): Tokens per second
+        burst (float): Bucket size, i.e. calls allowed back to back
+        now (float): Current time; the bucket starts full
+    """
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = now
+
+    def take(self, now: float) -> float:
+        """Takes a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, else seconds until one is available
+        """
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket kept in a file, shared by every process that opens it.
+
+    The bucket state (tokens left, last refill time) is read and written under
+    an exclusive `flock` on the file, so worker processes on one host draw from
+    a single quota. Times are `time.monotonic()` readings, which are host-wide.
+
+    Layout: magic "RTBK", version u32, tokens f64, updated f64, little-endian.
+
+    Args:
+        path (str): File to share, created if missing
+        rate (float): Tokens per second
+        burst (float): Bucket size, i.e. calls allowed back to back
+        now (float): Current time; a new bucket starts full
+
+    Raises:
+        ValueError: The file isn't a token bucket of this version
+    """
+
+    MAGIC = b"RTBK"
+    VERSION = 1
+    STATE = struct.Struct("<4sIdd")
+
+    def __init__(self, path: str, rate: float, burst: float, now: float):
+        import fcntl
+
+        super().__init__(rate, burst, now)
+        self.path = path
+        self._fcntl = fcntl
+        self._fd: Optional[int] = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._locked():
+            if os.fstat(self._fd).st_size == 0:
+                self._write()
+            else:
+                self._read()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    def _read(self) -> None:
+        data = os.pread(self._fd, self.STATE.size, 0)
+        if len(data) != self.STATE.size:
+            data = bytes(self.STATE.size)
+        magic, version, tokens, updated = self.STATE.unpack(data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.path} is not a version {self.VERSION} bucket.")
+        self._tokens, self._updated = tokens, updated
+
+    def _write(self) -> None:
+        state = self.STATE.pack(self.MAGIC, self.VERSION, self._tokens, self._updated)
+        os.pwrite(self._fd, state, 0)
+
+    def take(self, now: float) -> float:
+        with self._locked():
+            self._read()
+            # A bucket left over from before a reboot is ahead of the clock.
+            self._updated = min(self._updated, now)
+            wait = super().take(now)
+            self._write()
+        return wait
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class _Lane:
+    def __init__(self, max_queue: int, timeout: Optional[float]):
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.waiting: Deque[object] = deque()
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.admitted = 0
+        self.shed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class Scheduler:
+    """Rate limiter with priority lanes in front of Transact API.
+
+    Args:
+        rate (float): Calls per second allowed by the provider quota
+        burst (Optional[float], optional): Calls allowed back to back. Defaults
+        to `rate` (one second's worth).
+        max_queue (int, optional): Callers allowed to wait per lane. Defaults
+        to 100.
+        interactive_timeout (Optional[float], optional): Seconds an interactive
+        caller may wait before being shed. Defaults to 5.
+        bulk_timeout (Optional[float], optional): Same for bulk callers.
+        Defaults to None (wait as long as needed).
+        path (Optional[str], optional): Share the quota with every process
+        using the same file (see `SharedTokenBucket`). Defaults to None (this
+        process only).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        max_queue: int = 100,
+        interactive_timeout: Optional[float] = 5.0,
+        bulk_timeout: Optional[float] = None,
+        path: Optional[str] = None,
+    ):
+        self._cond = threading.Condition()
+        burst = burst or max(rate, 1.0)
+        now = time.monotonic()
+        self._bucket = (
+            TokenBucket(rate, burst, now)
+            if path is None
+            else SharedTokenBucket(path, rate, burst, now)
+        )
+        self._lanes: Dict[Priority, _Lane] = {
+            Priority.INTERACTIVE: _Lane(max_queue, interactive_timeout),
+            Priority.BULK: _Lane(max_queue, bulk_timeout),
+        }
+
+    def _head(self) -> Optional[object]:
+        for p in Priority:
+            if self._lanes[p].waiting:
+                return self._lanes[p].waiting[0]
+        return None
+
+    def acquire(
+        self, priority: Priority = Priority.INTERACTIVE, timeout: Optional[float] = None
+    ) -> float:
+        """Blocks until the caller may make one Transact API call.
+
+        Args:
+            priority (Priority, optional): Lane to wait in. Defaults to
+            INTERACTIVE.
+            timeout (Optional[float], optional): Seconds to wait at most.
+            Defaults to the lane's timeout.
+
+        Raises:
+            QueueFull: Too many callers are already waiting in the lane
+            DeadlineExceeded: The caller couldn't be admitted within `timeout`
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        lane = self._lanes[priority]
+        start = time.monotonic()
+        timeout = lane.timeout if timeout is None else timeout
+        deadline = None if timeout is None else start + timeout
+        ticket = object()
+        with self._cond:
+            if len(lane.waiting) >= lane.max_queue:
+                lane.rejected += 1
+                raise QueueFull(f"{priority.name.lower()} lane is full")
+            lane.waiting.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait: Optional[float] = None
+                    if self._head() is ticket:
+                        wait = self._bucket.take(now)
+                        if wait == 0:
+                            waited = now - start
+                            lane.admitted += 1
+                            lane.total_wait += waited
+                            lane.max_wait = max(lane.max_wait, waited)
+                            lane.waits.append(waited)
+                            return waited
+                    if deadline is not None:
+                        remaining = deadline - now
+                        # Shed as soon as the next token is known to come too late.
+                        if remaining <= 0 or (wait is not None and wait > remaining):
+                            lane.shed += 1
+                            raise DeadlineExceeded(
+                                f"not admitted within {timeout:.3f}s"
+                            )
+                        wait = remaining if wait is None else wait
+                    self._cond.wait(wait)
+            finally:
+                lane.waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[Priority, LaneStats]:
+        """Queue depth, admission counts and wait times per lane."""
+        with self._cond:
+            result = {}
+            for p, lane in self._lanes.items():
+                waits: List[float] = sorted(lane.waits)
+                result[p] = LaneStats(
+                    depth=len(lane.waiting),
+                    admitted=lane.admitted,
+                    shed=lane.shed,
+                    rejected=lane.rejected,
+                    mean_wait=lane.total_wait / lane.admitted if lane.admitted else 0.0,
+                    p95_wait=waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    max_wait=lane.max_wait,
+                )
+            return result
+
+
+_priority: "contextvars.ContextVar[Priority]" = contextvars.ContextVar(
+    "transact_api_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+@contextmanager
+def priority(p: Priority) -> Iterator[None]:
+    """Runs the enclosed Transact API calls in lane `p`."""
+    token = _priority.set(p)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def set_scheduler(scheduler: Optional[Scheduler]) -> None:
+    """Installs the process-wide scheduler, or removes it with None."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
+
+
+def get_scheduler() -> Optional[Scheduler]:
+    """Returns the process-wide scheduler.
+
+    Unless `set_scheduler` was called, one is created on first use from
+    `TRANSACT_API_RATE_LIMIT` (calls per second, the provider quota). Set
+    `TRANSACT_API_RATE_LIMIT_FILE` to share that quota between the worker
+    processes of a host; otherwise each process gets the full quota.
+
+    Returns:
+        Optional[Scheduler]: None when no rate limit is configured
+    """
+    global _scheduler
+    if _scheduler is None and TRANSACT_API_RATE_LIMIT:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler(
+                    float(TRANSACT_API_RATE_LIMIT),
+                    path=TRANSACT_API_RATE_LIMIT_FILE or None,
+                )
+    return _scheduler
@@ -0,0 +1,237 @@
+"""Warm-start snapshots of learned and precomputed validation state.
+
+`save_snapshot` writes what a worker has learned or built to a versioned file:
+routing number verdicts from the process-wide `VerdictStore`, and the location
+of the BIN table in use. `load_snapshot` restores that state in a fresh worker
+and precompiles the rule validators and codec plans. New workers then start
+without a burst of Transact API calls.
+
+A snapshot is ignored (and `load_snapshot` returns None) when it is missing,
+unreadable, older than `max_age`, or was written with different rules or file
+formats. The rule fingerprint covers the rule specs, the snapshot, verdict
+store and BIN table format versions, and the pydantic version.
+
+Each verdict keeps the time Transact API gave it (see `VerdictStore.records`),
+not the time of the snapshot, so a verdict carried through many snapshots
+still expires `max_age` after it was learned and is then verified again.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pydantic
+
+from app import bin_table, codec, verdicts
+from app.models import (
+    ACH_ACCOUNT_RULES,
+    CREDIT_CARD_FIELD_RULES,
+    Accreditation,
+    AchAccount,
+    CreditCard,
+    NewsletterSubscriptionSchema,
+)
+from app.rules import compile_rule, compile_schema
+
+FORMAT = "models-snapshot"
+VERSION = 2
+DEFAULT_MAX_AGE = verdicts.DEFAULT_MAX_AGE
+
+MODELS = (CreditCard, AchAccount, Accreditation, NewsletterSubscriptionSchema)
+RULES = (CREDIT_CARD_FIELD_RULES, ACH_ACCOUNT_RULES)
+
+
+class SnapshotInfo(NamedTuple):
+    loaded: int
+    stale: int
+    dropped: int
+
+
+def fingerprint() -> str:
+    """Identifies the code a snapshot was written by."""
+    parts = [
+        VERSION,
+        verdicts.VERSION,
+        bin_table.VERSION,
+        pydantic.VERSION,
+        [sorted(rules.items()) for rules in RULES],
+    ]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def warm_up() -> None:
+    """Precompiles the rule validators and codec field plans."""
+    for rules in RULES:
+        compile_schema(rules)
+        for rule in rules.values():
+            compile_rule(rule)
+    for model in MODELS:
+        codec.field_plan(model)
+        codec.field_plan(model, True)
+
+
+def _file_stamp(path: str) -> Dict[str, Any]:
+    st = os.stat(path)
+    return {"path": os.path.abspath(path), "size": st.st_size, "mtime": st.st_mtime}
+
+
+def save_snapshot(path: str) -> None:
+    """Writes the current warmable state to `path`.
+
+    The file is written next to `path` and renamed into place, so a worker
+    loading it never sees a partial snapshot.
+
+    Args:
+        path (str): Snapshot file
+    """
+    data: Dict[str, Any] = {
+        "format": FORMAT,
+        "version": VERSION,
+        "fingerprint": fingerprint(),
+        "created": time.time(),
+        "verdicts": {v.name: [] for v in verdicts.Verdict},
+        "bin_table": None,
+    }
+    store = verdicts.get_verdict_store()
+    if store is not None:
+        for number, verdict, learned in store.records():
+            data["verdicts"][verdict.name].append([int(number), learned])
+    table = bin_table.get_bin_table()
+    if table is not None:
+        data["bin_table"] = _file_stamp(table.path)
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _read_snapshot(
+    path: str, now: float, max_age: Optional[float]
+) -> Optional[Tuple[List[Tuple[str, verdicts.Verdict, float]], Any]]:
+    """Parses `path` into its verdict entries and BIN table stamp.
+
+    Returns None if the file is unreadable, from another format, version or
+    set of models, or older than `max_age`.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if (
+            data.get("format") != FORMAT
+            or data.get("version") != VERSION
+            or data.get("fingerprint") != fingerprint()
+        ):
+            return None
+        if max_age is not None and now - data["created"] > max_age:
+            return None
+        entries = [
+            (f"{number:09d}", verdicts.Verdict[name], float(learned))
+            for name, records in data["verdicts"].items()
+            for number, learned in records
+        ]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return entries, data.get("bin_table")
+
+
+def _restore_verdicts(
+    entries: List[Tuple[str, verdicts.Verdict, float]],
+) -> Tuple[int, int]:
+    """Adds `entries` the store doesn't have yet, returning (loaded, dropped)."""
+    loaded = dropped = 0
+    store = verdicts.get_verdict_store()
+    if store is None and entries:
+        capacity = max(verdicts.DEFAULT_CAPACITY, 2 * len(entries))
+        store = verdicts.load_verdict_store(None, capacity)
+    for number, verdict, learned in entries:
+        if store.get(number) is not None:
+            continue
+        if store.put(number, verdict, learned):
+            loaded += 1
+        else:
+            dropped += 1
+    return loaded, dropped
+
+
+def _restore_bin_table(stamp: Any) -> None:
+    """Opens the BIN table in `stamp` if none is loaded and the file is unchanged."""
+    if not stamp or bin_table.get_bin_table() is not None:
+        return
+    try:
+        if _file_stamp(stamp["path"]) == stamp:
+            bin_table.load_bin_table(stamp["path"])
+    except (OSError, ValueError):
+        pass
+
+
+def load_snapshot(
+    path: str, max_age: Optional[float] = DEFAULT_MAX_AGE
+) -> Optional[SnapshotInfo]:
+    """Restores warmable state from `path`, if it is usable.
+
+    Verdicts are added to the process-wide `VerdictStore`; a private in-memory
+    one is opened if none is configured. Verdicts learned more than `max_age`
+    ago are skipped, and so are verdicts the store already has or that don't
+    fit in it once it is full. The BIN table is opened if none is loaded yet
+    and the file is unchanged since the snapshot. Rule validators and codec
+    plans are precompiled either way.
+
+    Args:
+        path (str): Snapshot file
+        max_age (Optional[float], optional): Seconds after which a snapshot,
+        or a verdict in it, is stale. None accepts any age. Defaults to 7 days.
+
+    Returns:
+        Optional[SnapshotInfo]: Verdicts loaded, skipped as stale, and dropped
+        because the store is full; None if the snapshot was ignored
+    """
+    warm_up()
+    now = time.time()
+    snapshot = _read_snapshot(path, now, max_age)
+    if snapshot is None:
+        return None
+    entries, stamp = snapshot
+
+    fresh = [e for e in entries if max_age is None or now - e[2] <= max_age]
+    loaded, dropped = _restore_verdicts(fresh)
+    _restore_bin_table(stamp)
+    return SnapshotInfo(loaded, len(entries) - len(fresh), dropped)
+
+
+def snapshot_periodically(
+    path: str, interval: float, at_exit: bool = True
+) -> Callable[[], None]:
+    """Saves a snapshot every `interval` seconds from a daemon thread.
+
+    Args:
+        path (str): Snapshot file
+        interval (float): Seconds between snapshots
+        at_exit (bool, optional): Also save when the interpreter exits.
+        Defaults to True.
+
+    Returns:
+        Callable[[], None]: Stops the periodic snapshots
+    """
+    stopped = threading.Event()
+
+    def run() -> None:
+        while not stopped.wait(interval):
+            save_snapshot(path)
+
+    def final() -> None:
+        save_snapshot(path)
+
+    threading.Thread(target=run, name="snapshot", daemon=True).start()
+    if at_exit:
+        atexit.register(final)
+
+    def stop() -> None:
+        stopped.set()
+        atexit.unregister(final)
+
+    return stop
@@ -0,0 +1,359 @@
+"""Host-wide store of Transact API routing number verdicts.
+
+Every gunicorn worker on a host maps the same file, so a routing number that
+one worker had Transact API validate is known to all of them.
+
+The file is an open-addressed hash table with linear probing. Each slot is one
+aligned 64-bit word, `learned hour << 38 | (routing number + 1) << 8 | verdict`,
+with 0 meaning empty. Routing numbers have 9 digits, so they fit in 30 bits,
+and the learned hour (hours since the Unix epoch when the verdict was recorded)
+fits in the remaining 26. Readers take no lock:
+a slot is read and written as a single 64-bit word, so a reader sees either an
+empty slot or a complete entry, and slots are never emptied again. Writers
+serialize with an exclusive `flock` on the file (and a thread lock within a
+process).
+
+Verdicts expire `max_age` after they were learned: `get` ignores them, and
+`put` reuses their slots. The table never gets more than `MAX_LOAD` full,
+which keeps misses down to a few probes: at that point the live entries are
+rehashed without the expired ones (lookups running meanwhile may miss), and
+only if none have expired are new entries refused.
+
+Layout: header (magic "RVRD", version u32, slot count u32, used slots u32)
+followed by the slots, little-endian.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from enum import IntEnum
+from typing import Iterator, Optional, Tuple
+
+from app.helpers import validate_aba_routing_number
+from config import ROUTING_VERDICT_STORE
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX
+    fcntl = None
+
+MAGIC = b"RVRD"
+VERSION = 3
+HEADER = struct.Struct("<4sIII")
+SLOTS_OFFSET = HEADER.size
+COUNT_OFFSET = 12
+DEFAULT_CAPACITY = 1 << 16
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+MAX_LOAD = 0.7
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+_KEY_BITS = 30
+_KEY_MASK = (1 << _KEY_BITS) - 1
+_HOUR_SHIFT = 8 + _KEY_BITS
+_HOUR = 3600
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+class Verdict(IntEnum):
+    VALID = 1
+    INVALID = 2
+
+
+class VerdictStore:
+    """Shared open-addressed hash table of routing number verdicts.
+
+    Args:
+        path (Optional[str]): File to share, created if missing. None keeps the
+        table in anonymous memory, private to this process and its children.
+        capacity (int, optional): Slots when creating the file, rounded up to a
+        power of two. An existing file keeps its own. Defaults to 65536.
+        max_age (Optional[float], optional): Seconds after which a verdict is
+        ignored and asked for again. None keeps verdicts forever. Defaults to
+        7 days.
+
+    Raises:
+        ValueError: The file isn't a verdict store of this version
+        RuntimeError: `path` was given on a platform without `fcntl`
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+    ):
+        if sys.byteorder != "little":  # pragma: no cover
+            raise RuntimeError("VerdictStore requires a little-endian host.")
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        capacity = 1 << max(3, (capacity - 1).bit_length())
+        size = SLOTS_OFFSET + 8 * capacity
+
+        if path is None:
+            self._fd = None
+            self._mm = mmap.mmap(-1, size)
+            HEADER.pack_into(self._mm, 0, MAGIC, VERSION, capacity, 0)
+        else:
+            if fcntl is None:
+                raise RuntimeError("A shared VerdictStore requires fcntl (POSIX).")
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size == 0:
+                    os.ftruncate(self._fd, size)
+                    os.pwrite(self._fd, HEADER.pack(MAGIC, VERSION, capacity, 0), 0)
+                self._mm = mmap.mmap(self._fd, 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        magic, version, capacity, _ = HEADER.unpack_from(self._mm)
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or len(self._mm) < SLOTS_OFFSET + 8 * capacity
+        ):
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} verdict store.")
+        self.capacity = capacity
+        self._max_used = int(capacity * MAX_LOAD)
+        self._bits = capacity.bit_length() - 1
+        self._slots = memoryview(self._mm)[SLOTS_OFFSET:].cast("Q")
+
+    def _probe(self, key: int) -> Iterator[int]:
+        start = ((key * _GOLDEN) & _MASK64) >> (64 - self._bits)
+        for i in range(self.capacity):
+            yield (start + i) & (self.capacity - 1)
+
+    @staticmethod
+    def _key(routing_number: str) -> Optional[int]:
+        if len(routing_number) != 9 or not routing_number.isdigit():
+            return None
+        return int(routing_number) + 1
+
+    def _oldest_hour(self) -> int:
+        """Learned hour below which entries have expired."""
+        if self.max_age is None:
+            return 0
+        return int((time.time() - self.max_age) // _HOUR)
+
+    def get(self, routing_number: str) -> Optional[Verdict]:
+        """Looks up a verdict without locking.
+
+        Args:
+            routing_number (str): 9 digit routing number
+
+        Returns:
+            Optional[Verdict]: None if no worker has recorded one yet, or it
+            has expired
+        """
+        key = self._key(routing_number)
+        if key is None:
+            return None
+        slots = self._slots
+        for i in self._probe(key):
+            slot = slots[i]
+            if slot == 0:
+                return None
+            if (slot >> 8) & _KEY_MASK == key:
+                if slot >> _HOUR_SHIFT < self._oldest_hour():
+                    return None
+                return Verdict(slot & 0xFF)
+        return None
+
+    def _slot_for(self, key: int) -> Optional[int]:
+        """Finds where to write `key`: its own slot, an expired one, or a new one.
+
+        Must be called with the write lock held.
+        """
+        oldest = self._oldest_hour()
+        slots = self._slots
+        reusable = None
+        for i in self._probe(key):
+            slot = slots[i]
+            if slot == 0:
+                break
+            if (slot >> 8) & _KEY_MASK == key:
+                return i
+            if reusable is None and slot >> _HOUR_SHIFT < oldest:
+                reusable = i
+        else:
+            return reusable
+        if reusable is not None:
+            return reusable
+        (used,) = struct.unpack_from("<I", self._mm, COUNT_OFFSET)
+        if used >= self._max_used:
+            if not self._compact(oldest):
+                return None
+            return self._slot_for(key)
+        struct.pack_into("<I", self._mm, COUNT_OFFSET, used + 1)
+        return i
+
+    def _compact(self, oldest: int) -> bool:
+        """Rehashes the live entries, dropping expired ones.
+
+        Must be called with the write lock held.
+
+        Returns:
+            bool: Whether any slot was freed
+        """
+        slots = self._slots
+        live = [slot for slot in slots if slot and slot >> _HOUR_SHIFT >= oldest]
+        if len(live) >= self._max_used:
+            return False
+        for i in range(self.capacity):
+            slots[i] = 0
+        for slot in live:
+            for i in self._probe((slot >> 8) & _KEY_MASK):
+                if slots[i] == 0:
+                    slots[i] = slot
+                    break
+        struct.pack_into("<I", self._mm, COUNT_OFFSET, len(live))
+        return True
+
+    def put(
+        self, routing_number: str, verdict: Verdict, learned: Optional[float] = None
+    ) -> bool:
+        """Records a verdict, replacing any previous one.
+
+        Args:
+            routing_number (str): 9 digit routing number
+            verdict (Verdict): Verdict to record
+            learned (Optional[float], optional): When Transact API gave the
+            verdict, as a Unix time; kept to the hour. Defaults to now.
+
+        Returns:
+            bool: False if the number is malformed or the table is full (see
+            `MAX_LOAD`)
+        """
+        key = self._key(routing_number)
+        if key is None:
+            return False
+        hour = int((time.time() if learned is None else learned) // _HOUR)
+        entry = hour << _HOUR_SHIFT | key << 8 | verdict
+        with self._lock:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                i = self._slot_for(key)
+                if i is None:
+                    return False
+                self._slots[i] = entry
+                return True
+            finally:
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def items(self) -> Iterator[Tuple[str, Verdict]]:
+        """Iterates over every recorded (routing number, verdict) pair."""
+        for number, verdict, _ in self.records():
+            yield number, verdict
+
+    def records(self) -> Iterator[Tuple[str, Verdict, float]]:
+        """Iterates over every (routing number, verdict, learned) record.
+
+        `learned` is the Unix time of the start of the hour the verdict was
+        recorded in.
+        """
+        for slot in self._slots:
+            if slot:
+                number = ((slot >> 8) & _KEY_MASK) - 1
+                learned = float((slot >> _HOUR_SHIFT) * _HOUR)
+                yield f"{number:09d}", Verdict(slot & 0xFF), learned
+
+    def __len__(self) -> int:
+        return sum(1 for slot in self._slots if slot)
+
+    def close(self) -> None:
+        if getattr(self, "_slots", None) is not None:
+            self._slots.release()
+        self._mm.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_store: Optional[VerdictStore] = None
+_store_lock = threading.Lock()
+# A configured store that failed to open, so it isn't retried on every call.
+_unusable: Optional[str] = None
+
+
+def load_verdict_store(
+    path: Optional[str], capacity: int = DEFAULT_CAPACITY
+) -> VerdictStore:
+    """Opens a store and makes it the process-wide one.
+
+    Args:
+        path (Optional[str]): Shared file, or None for a private in-memory store
+        capacity (int, optional): Slots when creating it. Defaults to 65536.
+
+    Returns:
+        VerdictStore: The opened store
+    """
+    global _store
+    store = VerdictStore(path, capacity)
+    with _store_lock:
+        _store = store
+    return store
+
+
+def get_verdict_store() -> Optional[VerdictStore]:
+    """Returns the process-wide store.
+
+    Unless `load_verdict_store` was called, the file at `ROUTING_VERDICT_STORE`
+    is opened on first use. A file that can't be opened (e.g. one written by
+    another version) is logged and left alone, and verdicts then come straight
+    from Transact API.
+
+    Returns:
+        Optional[VerdictStore]: None when no store is configured or usable
+    """
+    global _store, _unusable
+    path = ROUTING_VERDICT_STORE
+    if _store is None and path and path != _unusable:
+        with _store_lock:
+            if _store is None and path != _unusable:
+                try:
+                    _store = VerdictStore(path)
+                except (OSError, ValueError, RuntimeError) as e:
+                    _unusable = path
+                    logger.warning("Not using routing verdict store: %s", e)
+    return _store
+
+
+def routing_number_verdict(routing_number: str) -> Optional[Verdict]:
+    """Gets a routing number's verdict, asking Transact API only when needed.
+
+    Verdicts are read from and recorded in the process-wide store, if one is
+    configured. Responses other than success ("101") and invalid ("215") are
+    not recorded.
+
+    Args:
+        routing_number (str): 9 digit routing number
+
+    Returns:
+        Optional[Verdict]: None if Transact API gave neither answer
+    """
+    store = get_verdict_store()
+    if store is not None:
+        verdict = store.get(routing_number)
+        if verdict is not None:
+            return verdict
+
+    status = validate_aba_routing_number(routing_number).get("statusCode")
+    if status == "215":
+        verdict = Verdict.INVALID
+    elif status == "101":
+        verdict = Verdict.VALID
+    else:
+        return None
+    if store is not None:
+        store.put(routing_number, verdict)
+    return verdict
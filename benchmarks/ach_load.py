@@ -0,0 +1,101 @@
+"""Load-tests `AchAccount` validation against the local fake Transact API.
+
+Usage:
+    python -m benchmarks.ach_load [--requests N] [--threads N] [--latency S]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from pydantic import ValidationError
+
+from app import helpers
+from app.fake_transact import FakeTransactServer
+from app.models import AchAccount
+
+ROUTING_NUMBERS = ("021000021", "011401533", "091000019", "011000015")
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def validate(routing: str) -> float:
+    start = time.perf_counter()
+    try:
+        AchAccount(account="123456789", routing=routing)
+    except ValidationError:
+        pass
+    return time.perf_counter() - start
+
+
+def run(
+    requests: int,
+    threads: int,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    invalid_rate: float = 0.0,
+    url: Optional[str] = None,
+) -> None:
+    server = None
+    if url is None:
+        server = FakeTransactServer(
+            latency=latency,
+            error_rate=error_rate,
+            invalid_rate=invalid_rate,
+            invalid_routing=ROUTING_NUMBERS[-1:],
+        ).start()
+        url = server.url
+    helpers.TRANSACT_API_BASE_URL = url
+    helpers.CLIENT_ID = helpers.CLIENT_ID or "load-test"
+    helpers.DEVELOPER_API_KEY = helpers.DEVELOPER_API_KEY or "load-test"
+
+    work = [ROUTING_NUMBERS[i % len(ROUTING_NUMBERS)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        timings: List[float] = list(pool.map(validate, work))
+    elapsed = time.perf_counter() - start
+
+    print(f"requests:    {requests} over {threads} threads in {elapsed:.2f}s")
+    print(f"throughput:  {requests / elapsed:.1f} validations/s")
+    print(
+        "latency:     "
+        f"mean {statistics.mean(timings) * 1e3:.2f}ms  "
+        f"p50 {percentile(timings, 0.50) * 1e3:.2f}ms  "
+        f"p95 {percentile(timings, 0.95) * 1e3:.2f}ms  "
+        f"p99 {percentile(timings, 0.99) * 1e3:.2f}ms  "
+        f"max {max(timings) * 1e3:.2f}ms"
+    )
+    if server is not None:
+        server.stop()
+        print(
+            f"connections: {server.connections} for {server.requests} requests "
+            f"({server.requests / max(server.connections, 1):.1f} requests/conn)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    parser.add_argument("--url", help="Use a running server instead")
+    args = parser.parse_args()
+    run(
+        args.requests,
+        args.threads,
+        args.latency,
+        args.error_rate,
+        args.invalid_rate,
+        args.url,
+    )
+
+
+if __name__ == "__main__":
+    main()
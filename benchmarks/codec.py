@@ -0,0 +1,60 @@
+"""Compares `app.codec` against pydantic's `.json()` / `parse_raw` path.
+
+Usage:
+    python -m benchmarks.codec [iterations]
+"""
+
+import sys
+import timeit
+from datetime import date
+
+from app import codec
+from app.models import (
+    Accreditation,
+    AchAccount,
+    CreditCard,
+    NewsletterSubscriptionSchema,
+)
+
+SAMPLES = (
+    CreditCard(
+        name="Test",
+        number="4242424242424242",
+        month="01",
+        year=str(date.today().year),
+        cvv="123",
+    ),
+    # `construct` skips the routing number lookup against Transact API.
+    AchAccount.construct(account="123456789", routing="021000021"),
+    Accreditation(annual_income=200_000, net_worth=1_000_000),
+    NewsletterSubscriptionSchema(email="test@email.com"),
+)
+
+
+def run(iterations: int) -> None:
+    print(f"{'model':<30}{'op':<8}{'pydantic':>12}{'codec':>12}{'speedup':>10}")
+    for sample in SAMPLES:
+        model = type(sample)
+        raw = sample.json()
+        cases = [("dumps", sample.json, lambda: codec.dumps(sample))]
+        if model is not AchAccount:
+            cases.append(
+                (
+                    "loads",
+                    lambda: model.parse_raw(raw),
+                    lambda: codec.loads(model, raw),
+                )
+            )
+        for op, baseline, fast in cases:
+            base = timeit.timeit(baseline, number=iterations)
+            new = timeit.timeit(fast, number=iterations)
+            print(
+                f"{model.__name__:<30}{op:<8}"
+                f"{base / iterations * 1e6:>10.2f}us"
+                f"{new / iterations * 1e6:>10.2f}us"
+                f"{base / new:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,75 @@
+"""Interactive Transact API latency during a bulk ACH import.
+
+Runs a bulk `validate_many` import in the BULK lane while a single interactive
+client validates one `AchAccount` at a time, all against the local fake
+Transact API behind a rate-limited `Scheduler`, then prints per-lane stats.
+
+Usage:
+    python -m benchmarks.scheduler [--rate N] [--bulk N] [--threads N]
+"""
+
+import argparse
+import threading
+import time
+
+from app import helpers
+from app.batch import validate_many
+from app.fake_transact import FakeTransactServer
+from app.models import AchAccount
+from app.scheduler import Priority, Scheduler, priority, set_scheduler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=200)
+    parser.add_argument("--bulk", type=int, default=1_000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    server = FakeTransactServer(latency=args.latency).start()
+    helpers.TRANSACT_API_BASE_URL = server.url
+    helpers.CLIENT_ID = helpers.CLIENT_ID or "load-test"
+    helpers.DEVELOPER_API_KEY = helpers.DEVELOPER_API_KEY or "load-test"
+    scheduler = Scheduler(args.rate, burst=1, max_queue=args.threads)
+    set_scheduler(scheduler)
+
+    done = threading.Event()
+    latencies = []
+
+    def interactive() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            AchAccount(account="123456789", routing="021000021")
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    client = threading.Thread(target=interactive)
+    client.start()
+    start = time.perf_counter()
+    with priority(Priority.BULK):
+        rows = [{"account": "123456789", "routing": "011401533"}] * args.bulk
+        validate_many(AchAccount, rows, max_workers=args.threads)
+    elapsed = time.perf_counter() - start
+    done.set()
+    client.join()
+    server.stop()
+
+    latencies.sort()
+    print(f"bulk import: {args.bulk} rows in {elapsed:.2f}s at {args.rate}/s quota")
+    print(
+        f"interactive: {len(latencies)} calls, "
+        f"p50 {latencies[len(latencies) // 2] * 1e3:.1f}ms, "
+        f"max {latencies[-1] * 1e3:.1f}ms"
+    )
+    for lane, stats in scheduler.stats().items():
+        print(
+            f"{lane.name.lower():<12} admitted {stats.admitted:>5}  "
+            f"shed {stats.shed}  rejected {stats.rejected}  "
+            f"wait mean {stats.mean_wait * 1e3:.1f}ms "
+            f"p95 {stats.p95_wait * 1e3:.1f}ms max {stats.max_wait * 1e3:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measures how batch validation scales from 1 to N threads.
+
+Validates `AchAccount` inputs against the local fake Transact API (I/O bound)
+and `CreditCard` inputs through a shared `ValidationCache` (CPU bound), checks
+every result, and prints throughput per thread count.
+
+Usage:
+    python -m benchmarks.threads [--max-threads N] [--items N] [--latency S]
+"""
+
+import argparse
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List
+
+from pydantic import ValidationError
+
+from app import helpers
+from app.batch import validate_many
+from app.cache import ValidationCache
+from app.fake_transact import FakeTransactServer
+from app.models import AchAccount, CreditCard
+
+
+def ach_items(n: int) -> List[Dict[str, Any]]:
+    routing = ("021000021", "011401533", "011000015")
+    return [{"account": str(1000 + i), "routing": routing[i % 3]} for i in range(n)]
+
+
+def credit_card_items(n: int) -> List[Dict[str, Any]]:
+    year = date.today().year
+    return [
+        {
+            "name": "Test",
+            "number": "4242424242424242",
+            "month": str(1 + i % 12),
+            "year": str(year + i % 5),
+            "cvv": f"{i % 1000:03}",
+        }
+        for i in range(n)
+    ]
+
+
+def check_ach(items: List[Dict[str, Any]], results: List[Any]) -> None:
+    for data, result in zip(items, results):
+        invalid = data["routing"] == "011000015"
+        assert isinstance(result, ValidationError) == invalid, data
+
+
+def measure(threads: int, run: Callable[[int], None]) -> float:
+    start = time.perf_counter()
+    run(threads)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-threads", type=int, default=16)
+    parser.add_argument("--items", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    server = FakeTransactServer(
+        latency=args.latency, invalid_routing=["011000015"]
+    ).start()
+    helpers.TRANSACT_API_BASE_URL = server.url
+    helpers.CLIENT_ID = helpers.CLIENT_ID or "load-test"
+    helpers.DEVELOPER_API_KEY = helpers.DEVELOPER_API_KEY or "load-test"
+
+    ach = ach_items(args.items)
+    cards = credit_card_items(args.items * 10)
+
+    def run_ach(threads: int) -> None:
+        check_ach(ach, validate_many(AchAccount, ach, max_workers=threads))
+
+    def run_cards(threads: int) -> None:
+        cache = ValidationCache(CreditCard, maxsize=len(cards), stripes=threads)
+        for _ in range(2):
+            results = validate_many(CreditCard, cards, threads, cache)
+            assert all(isinstance(r, CreditCard) for r in results)
+
+    print(f"{'threads':>8}{'ach/s':>12}{'speedup':>10}{'card/s':>12}{'speedup':>10}")
+    threads, base = 1, None
+    while threads <= args.max_threads:
+        ach_rate = len(ach) / measure(threads, run_ach)
+        card_rate = 2 * len(cards) / measure(threads, run_cards)
+        if base is None:
+            base = (ach_rate, card_rate)
+        print(
+            f"{threads:>8}{ach_rate:>12.1f}{ach_rate / base[0]:>9.2f}x"
+            f"{card_rate:>12.1f}{card_rate / base[1]:>9.2f}x"
+        )
+        threads *= 2
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,10 @@ load_dotenv()
 
 CLIENT_ID = os.environ.get("TRANSACT_API_CLIENT_ID")
 DEVELOPER_API_KEY = os.environ.get("TRANSACT_API_DEVELOPER_API_KEY")
+TRANSACT_API_BASE_URL = os.environ.get(
+    "TRANSACT_API_BASE_URL", "https://api.norcapsecurities.com/tapiv3/index.php/v3/"
+)
+BIN_TABLE_PATH = os.environ.get("BIN_TABLE_PATH")
+ROUTING_VERDICT_STORE = os.environ.get("ROUTING_VERDICT_STORE")
+TRANSACT_API_RATE_LIMIT = os.environ.get("TRANSACT_API_RATE_LIMIT")
+TRANSACT_API_RATE_LIMIT_FILE = os.environ.get("TRANSACT_API_RATE_LIMIT_FILE")